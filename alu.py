@@ -2,7 +2,7 @@
 ALU implementation for RISC-V simulator.
 """
 
-from bit_utils import format_bits, bits_to_int, int_to_bits
+from bit_utils import format_bits, bits_to_uint, uint_to_bits, from_hex_string, to_hex_string
 
 class FullAdder:
     @staticmethod
@@ -20,39 +20,47 @@ class RippleCarryAdder:
         if len(a) != self.width or len(b) != self.width:
             raise ValueError(f"Input vectors must be {self.width} bits")
         
-        sum_bits = []
-        carry = carry_in
+        # Kogge-Stone prefix: generate/propagate per bit (LSB first), combined in log2(width) passes
+        g = [a[i] & b[i] for i in range(self.width - 1, -1, -1)]
+        p = [a[i] ^ b[i] for i in range(self.width - 1, -1, -1)]
         
-        for i in range(self.width - 1, -1, -1):
-            sum_bit, carry = FullAdder.add(a[i], b[i], carry)
-            sum_bits.insert(0, sum_bit)
+        G = g[:]
+        P = p[:]
+        G[0] = g[0] | (p[0] & carry_in)
         
-        return sum_bits, carry
+        distance = 1
+        while distance < self.width:
+            G = [G[i] if i < distance else G[i] | (P[i] & G[i - distance]) for i in range(self.width)]
+            P = [P[i] if i < distance else P[i] & P[i - distance] for i in range(self.width)]
+            distance <<= 1
+        
+        carries = [carry_in] + G[:-1]
+        sum_bits = [p[i] ^ carries[i] for i in range(self.width - 1, -1, -1)]
+        
+        return sum_bits, G[-1]
     
     def subtract(self, a: list[int], b: list[int]) -> tuple[list[int], int]:
-        b_neg = [1 - bit for bit in b]
-        
-        carry = 1
-        for i in range(self.width - 1, -1, -1):
-            sum_bit, carry = FullAdder.add(b_neg[i], 0, carry)
-            b_neg[i] = sum_bit
-            if carry == 0:
-                break
+        b_inv = [1 - bit for bit in b]
         
-        return self.add(a, b_neg, 0)
+        return self.add(a, b_inv, 1)
 
 class ALU:
     def __init__(self, width: int = 32):
         self.width = width
-        self.adder = RippleCarryAdder(width)
+        self.mask = (1 << width) - 1
     
     def add(self, a: list[int], b: list[int]) -> dict:
         if len(a) != self.width or len(b) != self.width:
             raise ValueError(f"Input vectors must be {self.width} bits")
         
-        result, carry_out = self.adder.add(a, b, 0)
+        ua = bits_to_uint(a)
+        ub = bits_to_uint(b)
+        total = ua + ub
+        carry_out = total >> self.width
+        r = total & self.mask
+        result = uint_to_bits(r, self.width)
         
-        flags = self._generate_flags(a, b, result, carry_out, is_subtraction=False)
+        flags = self._generate_flags(ua, ub, r, carry_out, is_subtraction=False)
         
         return {
             'result': result,
@@ -66,9 +74,14 @@ class ALU:
         if len(a) != self.width or len(b) != self.width:
             raise ValueError(f"Input vectors must be {self.width} bits")
         
-        result, carry_out = self.adder.subtract(a, b)
+        ua = bits_to_uint(a)
+        ub = bits_to_uint(b)
+        total = ua + (~ub & self.mask) + 1
+        carry_out = total >> self.width
+        r = total & self.mask
+        result = uint_to_bits(r, self.width)
         
-        flags = self._generate_flags(a, b, result, carry_out, is_subtraction=True)
+        flags = self._generate_flags(ua, ub, r, carry_out, is_subtraction=True)
         
         return {
             'result': result,
@@ -82,8 +95,11 @@ class ALU:
         if len(a) != self.width or len(b) != self.width:
             raise ValueError(f"Input vectors must be {self.width} bits")
         
-        result = [a[i] & b[i] for i in range(self.width)]
-        flags = self._generate_flags(a, b, result, 0, is_subtraction=False)
+        ua = bits_to_uint(a)
+        ub = bits_to_uint(b)
+        r = ua & ub
+        result = uint_to_bits(r, self.width)
+        flags = self._generate_flags(ua, ub, r, 0, is_subtraction=False)
         
         return {
             'result': result,
@@ -97,8 +113,11 @@ class ALU:
         if len(a) != self.width or len(b) != self.width:
             raise ValueError(f"Input vectors must be {self.width} bits")
         
-        result = [a[i] | b[i] for i in range(self.width)]
-        flags = self._generate_flags(a, b, result, 0, is_subtraction=False)
+        ua = bits_to_uint(a)
+        ub = bits_to_uint(b)
+        r = ua | ub
+        result = uint_to_bits(r, self.width)
+        flags = self._generate_flags(ua, ub, r, 0, is_subtraction=False)
         
         return {
             'result': result,
@@ -112,8 +131,11 @@ class ALU:
         if len(a) != self.width or len(b) != self.width:
             raise ValueError(f"Input vectors must be {self.width} bits")
         
-        result = [a[i] ^ b[i] for i in range(self.width)]
-        flags = self._generate_flags(a, b, result, 0, is_subtraction=False)
+        ua = bits_to_uint(a)
+        ub = bits_to_uint(b)
+        r = ua ^ ub
+        result = uint_to_bits(r, self.width)
+        flags = self._generate_flags(ua, ub, r, 0, is_subtraction=False)
         
         return {
             'result': result,
@@ -123,21 +145,35 @@ class ALU:
             'V': 0
         }
     
-    def _generate_flags(self, a: list[int], b: list[int], result: list[int], 
+    def _generate_flags(self, ua: int, ub: int, r: int,
                            carry_out: int, is_subtraction: bool) -> dict:
-        N = result[0]
-        
-        Z = 1 if all(bit == 0 for bit in result) else 0
+        sign = self.width - 1
         
+        N = r >> sign
+        Z = int(r == 0)
         C = carry_out
         
         if is_subtraction:
-            V = 1 if (a[0] != b[0]) and (result[0] != a[0]) else 0
+            V = (((ua ^ ub) & (ua ^ r)) >> sign) & 1
         else:
-            V = 1 if (a[0] == b[0]) and (result[0] != a[0]) else 0
+            V = ((~(ua ^ ub) & (ua ^ r)) >> sign) & 1
         
         return {'N': N, 'Z': Z, 'C': C, 'V': V}
     
+    def execute_int(self, a: int, b: int, op: str) -> int:
+        if op == 'ADD':
+            return (a + b) & self.mask
+        elif op == 'SUB':
+            return (a - b) & self.mask
+        elif op == 'AND':
+            return a & b
+        elif op == 'OR':
+            return a | b
+        elif op == 'XOR':
+            return a ^ b
+        else:
+            raise ValueError(f"Unsupported ALU operation: {op}")
+    
     def execute(self, a: list[int], b: list[int], op: str) -> dict:
         if op == 'ADD':
             return self.add(a, b)
@@ -167,13 +203,11 @@ def test_alu():
     for a_hex, b_hex, op, expected_result_hex, expected_flags in test_cases:
         print(f"\nTesting {op}: {a_hex} {op} {b_hex}")
         
-        from bit_utils import from_hex_string
         a_bits = from_hex_string(a_hex, 32)
         b_bits = from_hex_string(b_hex, 32)
         
         result = alu.execute(a_bits, b_bits, op)
         
-        from bit_utils import to_hex_string
         result_hex = to_hex_string(result['result'])
         
         print(f"  Operand A: {format_bits(a_bits, 8)} ({a_hex})")
@@ -2,7 +2,8 @@
 Single-cycle RISC-V CPU implementation
 """
 
-from bit_utils import bits_to_int, int_to_bits, to_hex_string, from_hex_string
+from array import array
+
 from registers import RegisterFile
 from alu import ALU
 from shifter import Shifter
@@ -10,6 +11,8 @@ from instruction_decoder import InstructionDecoder
 from control_unit import ControlUnit
 from memory import InstructionMemory, DataMemory
 
+_IMM_FIELDS = {'I': 'imm_i', 'S': 'imm_s', 'U': 'imm_u', 'J': 'imm_j'}
+
 class CPU:
     def __init__(self, imem_size: int = 1024, dmem_size: int = 1024):
         self.reg_file = RegisterFile(32, 32)
@@ -26,120 +29,79 @@ class CPU:
         self.halted = False
         self.cycle_count = 0
         self.instruction_count = 0
+        
+        self._decode_cache = {}
     
-    def load_program(self, instructions: list[list[int]], start_address: int = 0x00000000):
+    def load_program(self, instructions: list[list[int]] | array, start_address: int = 0x00000000):
         self.imem.load_program(instructions, start_address)
+        self._decode_cache.clear()
+        for addr, word in self.imem.loaded_words():
+            self._decode_cache[addr] = self._predecode(word)
         self.pc = start_address
     
-    def execute_cycle(self) -> bool:
-        if self.halted:
-            return False
+    def _predecode(self, instruction: int):
+        if instruction == 0:
+            return None
         
-        try:
-            instruction = self.imem.read(self.pc)
-        except ValueError:
-            self.halted = True
-            return False
-        
-        if all(bit == 0 for bit in instruction):
-            if bits_to_int(instruction) == 0:
-                self.halted = True
-                return False
-        
-        decoded = self.decoder.decode(instruction)
+        decoded = self.decoder.decode_u32(instruction)
         instr_name = self.decoder.get_instruction_name(decoded)
-        
-        if instr_name == 'JAL' and decoded['rd'] == 0:
-            imm_j = bits_to_int(decoded['imm_j_sext'])
-            if imm_j == 0:
-                self.halted = True
-                return False
-        
         ctrl = self.control.generate_control_signals(decoded, instr_name)
         
-        rs1_data = self.reg_file.read(decoded['rs1'])
-        rs2_data = self.reg_file.read(decoded['rs2'])
-        
-        if ctrl['ALUSrc'] == 1:
-            if ctrl['ImmType'] == 'I':
-                alu_b = decoded['imm_i_sext']
-            elif ctrl['ImmType'] == 'S':
-                alu_b = decoded['imm_s_sext']
-            elif ctrl['ImmType'] == 'U':
-                alu_b = decoded['imm_u_sext']
-            elif ctrl['ImmType'] == 'J':
-                alu_b = decoded['imm_j_sext']
-            else:
-                alu_b = rs2_data
-        else:
-            alu_b = rs2_data
+        imm_field = _IMM_FIELDS.get(ctrl['ImmType'])
+        imm = decoded[imm_field] & 0xFFFFFFFF if imm_field else 0
+        op = ctrl['ALUOp']
         
-        if ctrl['UseShift'] == 1:
+        if instr_name == 'JAL' and decoded['rd'] == 0 and decoded['imm_j'] == 0:
+            handler = self._exec_halt
+        elif ctrl['UseShift'] == 1:
+            op = ctrl['ShiftOp']
             if ctrl['ALUSrc'] == 1:
-                if ctrl['ImmType'] == 'I':
-                    shift_amount = decoded['imm_i'][7:12]
-                else:
-                    shift_amount = alu_b[27:32]
+                handler, imm = self._exec_shift_imm, decoded['shamt']
             else:
-                shift_amount = rs2_data[27:32]
-            result = self.shifter.execute(rs1_data, shift_amount, ctrl['ShiftOp'])
-            alu_result = result
-            alu_zero = all(bit == 0 for bit in result)
-        elif ctrl['ALUOp'] == 'LUI':
-            result = decoded['imm_u_sext']
-            alu_result = result
-            alu_zero = all(bit == 0 for bit in result)
-        else:
-            alu_result_dict = self.alu.execute(rs1_data, alu_b, ctrl['ALUOp'])
-            alu_result = alu_result_dict['result']
-            alu_zero = alu_result_dict['Z']
-        
-        mem_data = [0] * 32
-        if ctrl['MemRead'] == 1:
-            mem_addr = bits_to_int(alu_result)
-            try:
-                mem_data = self.dmem.read_word(mem_addr)
-            except ValueError as e:
-                print(f"Warning: Memory read error at {hex(mem_addr)}: {e}")
-                mem_data = [0] * 32
-        
-        if ctrl['MemWrite'] == 1:
-            mem_addr = bits_to_int(alu_result)
-            try:
-                self.dmem.write_word(mem_addr, rs2_data)
-            except ValueError as e:
-                print(f"Warning: Memory write error at {hex(mem_addr)}: {e}")
-        
-        if ctrl['MemToReg'] == 1:
-            write_data = mem_data
+                handler = self._exec_shift_reg
+        elif ctrl['MemRead'] == 1:
+            handler = self._exec_load
+        elif ctrl['MemWrite'] == 1:
+            handler = self._exec_store
+        elif ctrl['Branch'] == 1:
+            handler = self._exec_beq if instr_name == 'BEQ' else self._exec_bne
+            imm = decoded['imm_b']
         elif ctrl['Jump'] == 1:
-            write_data = int_to_bits(self.pc + 4, 32)
-        else:
-            write_data = alu_result
-        
-        branch_taken = False
-        if ctrl['Branch'] == 1:
-            if instr_name == 'BEQ':
-                branch_taken = (rs1_data == rs2_data)
-            elif instr_name == 'BNE':
-                branch_taken = (rs1_data != rs2_data)
-        
-        if ctrl['Jump'] == 1:
             if instr_name == 'JAL':
-                next_pc = self.pc + bits_to_int(decoded['imm_j_sext'])
-            elif instr_name == 'JALR':
-                next_pc = (bits_to_int(rs1_data) + bits_to_int(decoded['imm_i_sext'])) & 0xFFFFFFFE
+                handler, imm = self._exec_jal, decoded['imm_j']
             else:
-                next_pc = self.pc + 4
-        elif branch_taken:
-            next_pc = self.pc + bits_to_int(decoded['imm_b_sext'])
+                handler, imm = self._exec_jalr, decoded['imm_i']
+        elif op == 'LUI':
+            handler = self._exec_lui
+        elif ctrl['RegWrite'] == 1:
+            handler = self._exec_alu_imm if ctrl['ALUSrc'] == 1 else self._exec_alu_reg
         else:
-            next_pc = self.pc + 4
+            handler = self._exec_nop
         
-        if ctrl['RegWrite'] == 1:
-            self.reg_file.write(decoded['rd'], write_data, enable=True)
+        return handler, decoded['rd'], decoded['rs1'], decoded['rs2'], imm, op
+    
+    def execute_cycle(self) -> bool:
+        if self.halted:
+            return False
+        
+        cached = self._decode_cache.get(self.pc)
+        if cached is None:
+            try:
+                instruction = self.imem.read_int(self.pc)
+            except ValueError:
+                self.halted = True
+                return False
+            
+            cached = self._predecode(instruction)
+            if cached is None:
+                self.halted = True
+                return False
+            self._decode_cache[self.pc] = cached
         
-        self.pc = next_pc
+        handler, rd, rs1, rs2, imm, op = cached
+        handler(rd, rs1, rs2, imm, op)
+        if self.halted:
+            return False
         
         self.reg_file.clock_edge()
         
@@ -148,15 +110,101 @@ class CPU:
         
         return True
     
+    def _exec_alu_reg(self, rd: int, rs1: int, rs2: int, imm: int, op: str):
+        reg_file = self.reg_file
+        reg_file.write_int(rd, self.alu.execute_int(reg_file.read_int(rs1), reg_file.read_int(rs2), op))
+        self.pc += 4
+    
+    def _exec_alu_imm(self, rd: int, rs1: int, rs2: int, imm: int, op: str):
+        reg_file = self.reg_file
+        reg_file.write_int(rd, self.alu.execute_int(reg_file.read_int(rs1), imm, op))
+        self.pc += 4
+    
+    def _exec_shift_reg(self, rd: int, rs1: int, rs2: int, imm: int, op: str):
+        reg_file = self.reg_file
+        shift_amount = reg_file.read_int(rs2) & 0x1F
+        reg_file.write_int(rd, self.shifter.execute_int(reg_file.read_int(rs1), shift_amount, op))
+        self.pc += 4
+    
+    def _exec_shift_imm(self, rd: int, rs1: int, rs2: int, imm: int, op: str):
+        reg_file = self.reg_file
+        reg_file.write_int(rd, self.shifter.execute_int(reg_file.read_int(rs1), imm, op))
+        self.pc += 4
+    
+    def _exec_lui(self, rd: int, rs1: int, rs2: int, imm: int, op: str):
+        self.reg_file.write_int(rd, imm)
+        self.pc += 4
+    
+    def _exec_load(self, rd: int, rs1: int, rs2: int, imm: int, op: str):
+        mem_addr = self.alu.execute_int(self.reg_file.read_int(rs1), imm, op)
+        try:
+            mem_data = self.dmem.read_word_int(mem_addr)
+        except ValueError as e:
+            print(f"Warning: Memory read error at {hex(mem_addr)}: {e}")
+            mem_data = 0
+        
+        self.reg_file.write_int(rd, mem_data)
+        self.pc += 4
+    
+    def _exec_store(self, rd: int, rs1: int, rs2: int, imm: int, op: str):
+        reg_file = self.reg_file
+        mem_addr = self.alu.execute_int(reg_file.read_int(rs1), imm, op)
+        try:
+            self.dmem.write_word_int(mem_addr, reg_file.read_int(rs2))
+        except ValueError as e:
+            print(f"Warning: Memory write error at {hex(mem_addr)}: {e}")
+        
+        self.pc += 4
+    
+    def _exec_beq(self, rd: int, rs1: int, rs2: int, imm: int, op: str):
+        if self.reg_file.read_int(rs1) == self.reg_file.read_int(rs2):
+            self.pc += imm
+        else:
+            self.pc += 4
+    
+    def _exec_bne(self, rd: int, rs1: int, rs2: int, imm: int, op: str):
+        if self.reg_file.read_int(rs1) != self.reg_file.read_int(rs2):
+            self.pc += imm
+        else:
+            self.pc += 4
+    
+    def _exec_jal(self, rd: int, rs1: int, rs2: int, imm: int, op: str):
+        self.reg_file.write_int(rd, (self.pc + 4) & 0xFFFFFFFF)
+        self.pc += imm
+    
+    def _exec_jalr(self, rd: int, rs1: int, rs2: int, imm: int, op: str):
+        target = (self.reg_file.read_int(rs1) + imm) & 0xFFFFFFFE
+        self.reg_file.write_int(rd, (self.pc + 4) & 0xFFFFFFFF)
+        self.pc = target
+    
+    def _exec_nop(self, rd: int, rs1: int, rs2: int, imm: int, op: str):
+        self.pc += 4
+    
+    def _exec_halt(self, rd: int, rs1: int, rs2: int, imm: int, op: str):
+        self.halted = True
+    
+    def step_many(self, budget: int) -> int:
+        executed = 0
+        execute_cycle = self.execute_cycle
+        
+        while executed < budget and execute_cycle():
+            executed += 1
+        
+        return executed
+    
     def run(self, max_cycles: int = 1000, verbose: bool = False) -> dict:
         initial_pc = self.pc
         
-        while not self.halted and self.cycle_count < max_cycles:
-            if verbose:
+        execute_cycle = self.execute_cycle
+        
+        if verbose:
+            while not self.halted and self.cycle_count < max_cycles:
                 print(f"Cycle {self.cycle_count}: PC = {hex(self.pc)}")
-            
-            if not self.execute_cycle():
-                break
+                
+                if not execute_cycle():
+                    break
+        else:
+            self.step_many(max_cycles - self.cycle_count)
         
         return {
             'cycles': self.cycle_count,
@@ -172,9 +220,16 @@ class CPU:
         self.cycle_count = 0
         self.instruction_count = 0
         
-        for i in range(32):
-            self.reg_file.write(i, [0] * 32, enable=False)
-        self.reg_file.clock_edge()
+        self.reg_file.clear()
+        self.imem.clear()
+        self.dmem.clear()
+        self._decode_cache.clear()
+    
+    def reg(self, index: int) -> int:
+        return self.reg_file.read_int(index)
+    
+    def mem_word(self, address: int) -> int:
+        return self.dmem.read_word_int(address)
     
     def get_state(self) -> dict:
         return {
@@ -185,4 +240,14 @@ class CPU:
             'registers': self.reg_file.dump_registers(),
             'data_memory': self.dmem.dump_memory()
         }
+    
+    def get_state_int(self) -> dict:
+        return {
+            'pc': self.pc,
+            'halted': self.halted,
+            'cycle_count': self.cycle_count,
+            'instruction_count': self.instruction_count,
+            'registers': self.reg_file.dump_registers_int(),
+            'data_memory': self.dmem.dump_memory()
+        }
 
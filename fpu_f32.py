@@ -2,8 +2,20 @@
 FPU implementation for RISC-V simulator.
 """
 
-from bit_utils import format_bits, to_hex_string, from_hex_string, int_to_bits, bits_to_int
-from alu import ALU
+import math
+import operator
+import struct
+from functools import lru_cache
+
+from bit_utils import to_hex_string, bits_to_uint, uint_to_bits
+
+_POS_INF = 0x7F800000
+_NEG_INF = 0xFF800000
+_CANONICAL_NAN = 0x7FC00000
+_MIN_NORMAL = 0x00800000
+
+_F32 = struct.Struct('>f')
+_U32 = struct.Struct('>I')
 
 class Float32:
     def __init__(self):
@@ -11,172 +23,195 @@ class Float32:
         self.exp_bits = 8
         self.frac_bits = 23
         self.bias = 127
-        self.alu = ALU(32)
     
     def pack_f32(self, value: float) -> dict:
-        import struct
-        
-        if repr(value) == '-0.0':
-            return {
-                'bits': [1] + [0] * 31,
-                'hex': '0x80000000',
-                'flags': {'overflow': 0, 'underflow': 0, 'invalid': 0, 'inexact': 0}
-            }
-        
-        if value == 0.0:
-            return {
-                'bits': [0] * 32,
-                'hex': '0x00000000',
-                'flags': {'overflow': 0, 'underflow': 0, 'invalid': 0, 'inexact': 0}
-            }
-        
-        if value == float('inf'):
-            return {
-                'bits': [0] + [1] * 8 + [0] * 23,
-                'hex': '0x7F800000',
-                'flags': {'overflow': 1, 'underflow': 0, 'invalid': 0, 'inexact': 0}
-            }
-        
-        if value == float('-inf'):
-            return {
-                'bits': [1] + [1] * 8 + [0] * 23,
-                'hex': '0xFF800000',
-                'flags': {'overflow': 1, 'underflow': 0, 'invalid': 0, 'inexact': 0}
-            }
-        
-        if str(value) == 'nan' or str(value) == '-nan':
-            return {
-                'bits': [0] + [1] * 8 + [1] + [0] * 22,
-                'hex': '0x7FC00000',
-                'flags': {'overflow': 0, 'underflow': 0, 'invalid': 1, 'inexact': 0}
-            }
-        
-        packed_bytes = struct.pack('>f', value)
-        packed_int = int.from_bytes(packed_bytes, 'big')
-        
-        if value == -0.0:
-            packed_int = 0x80000000
-        
-        bits = []
-        for i in range(32):
-            bits.append((packed_int >> (31 - i)) & 1)
-
-        flags = {'overflow': 0, 'underflow': 0, 'invalid': 0, 'inexact': 0}
-        
-        exp = (packed_int >> 23) & 0xFF
-        if exp == 255:
-            if (packed_int & 0x7FFFFF) == 0:
-                flags['overflow'] = 1
-            else:
-                flags['invalid'] = 1
-        elif exp == 0 and (packed_int & 0x7FFFFF) != 0:
-            flags['underflow'] = 1
+        if value == 0:
+            # 0.0 and -0.0 compare equal, so they would share a cache entry
+            packed_int, flags = self._pack_u32(value)
+        else:
+            if value != value:
+                value = math.nan
+            packed_int, overflow, underflow, invalid, inexact = _pack_f32_cached(value)
+            flags = {'overflow': overflow, 'underflow': underflow, 'invalid': invalid, 'inexact': inexact}
         
         return {
-            'bits': bits,
-            'hex': to_hex_string(bits),
+            'bits': uint_to_bits(packed_int, 32),
+            'hex': f"0x{packed_int:08X}",
             'flags': flags
         }
     
     def unpack_f32(self, bits: list[int]) -> dict:
-        import struct
-        
         if len(bits) != 32:
             raise ValueError("Input must be 32 bits")
         
-        packed_int = 0
-        for i, bit in enumerate(bits):
-            packed_int |= bit * (2 ** (31 - i))
-        
-        packed_bytes = packed_int.to_bytes(4, 'big')
-        value = struct.unpack('>f', packed_bytes)[0]
-        
         return {
-            'value': value,
+            'value': self._unpack_u32(bits_to_uint(bits)),
             'flags': {'overflow': 0, 'underflow': 0, 'invalid': 0, 'inexact': 0}
         }
     
-    def fadd_f32(self, a_bits: list[int], b_bits: list[int]) -> dict:
-        a_unpacked = self.unpack_f32(a_bits)
-        b_unpacked = self.unpack_f32(b_bits)
+    @staticmethod
+    def _pack_u32(value: float) -> tuple[int, dict]:
+        try:
+            packed_int = _U32.unpack(_F32.pack(value))[0]
+        except OverflowError:
+            packed_int = _NEG_INF if value < 0 else _POS_INF
         
-        a_value = a_unpacked['value']
-        b_value = b_unpacked['value']
+        return Float32._classify_u32(packed_int)
+    
+    @staticmethod
+    def _classify_u32(packed_int: int) -> tuple[int, dict]:
+        flags = {'overflow': 0, 'underflow': 0, 'invalid': 0, 'inexact': 0}
+        
+        abs_bits = packed_int & 0x7FFFFFFF
+        if abs_bits > _POS_INF:
+            flags['invalid'] = 1
+            packed_int = _CANONICAL_NAN
+        elif abs_bits == _POS_INF:
+            flags['overflow'] = 1
+        elif 0 < abs_bits < _MIN_NORMAL:
+            flags['underflow'] = 1
+        
+        return packed_int, flags
+    
+    def _unpack_u32(self, value: int) -> float:
+        return _F32.unpack(_U32.pack(value))[0]
+    
+    def _binop(self, a_bits: list[int], b_bits: list[int], op) -> tuple:
+        if len(a_bits) != 32 or len(b_bits) != 32:
+            raise ValueError("Input must be 32 bits")
         
-        result_value = a_value + b_value
+        a_value = self._unpack_u32(bits_to_uint(a_bits))
+        b_value = self._unpack_u32(bits_to_uint(b_bits))
+        result_value = op(a_value, b_value)
+        packed_int, flags = self._pack_u32(result_value)
         
-        result_packed = self.pack_f32(result_value)
+        return uint_to_bits(packed_int, 32), flags, a_value, b_value, result_value
+    
+    def fadd_f32(self, a_bits: list[int], b_bits: list[int], trace: bool = False) -> dict:
+        result, flags, a_value, b_value, result_value = self._binop(a_bits, b_bits, operator.add)
         
-        trace = []
-        trace.append({
-            'step': 0,
-            'description': 'Float32 addition',
-            'a_value': a_value,
-            'b_value': b_value,
-            'result_value': result_value,
-            'action': f'Add: {a_value} + {b_value} = {result_value}'
-        })
+        steps = []
+        if trace:
+            steps.append({
+                'step': 0,
+                'description': 'Float32 addition',
+                'a_value': a_value,
+                'b_value': b_value,
+                'result_value': result_value,
+                'action': f'Add: {a_value} + {b_value} = {result_value}'
+            })
         
         return {
-            'result': result_packed['bits'],
-            'flags': result_packed['flags'],
-            'trace': trace
+            'result': result,
+            'flags': flags,
+            'trace': steps
         }
     
-    def fsub_f32(self, a_bits: list[int], b_bits: list[int]) -> dict:
-        a_unpacked = self.unpack_f32(a_bits)
-        b_unpacked = self.unpack_f32(b_bits)
-        
-        a_value = a_unpacked['value']
-        b_value = b_unpacked['value']
+    def fsub_f32(self, a_bits: list[int], b_bits: list[int], trace: bool = False) -> dict:
+        result, flags, a_value, b_value, result_value = self._binop(a_bits, b_bits, operator.sub)
         
-        result_value = a_value - b_value
+        steps = []
+        if trace:
+            steps.append({
+                'step': 0,
+                'description': 'Float32 subtraction',
+                'a_value': a_value,
+                'b_value': b_value,
+                'result_value': result_value,
+                'action': f'Subtract: {a_value} - {b_value} = {result_value}'
+            })
         
-        result_packed = self.pack_f32(result_value)
+        return {
+            'result': result,
+            'flags': flags,
+            'trace': steps
+        }
+    
+    def fmul_f32(self, a_bits: list[int], b_bits: list[int], trace: bool = False) -> dict:
+        result, flags, a_value, b_value, result_value = self._binop(a_bits, b_bits, operator.mul)
         
-        trace = []
-        trace.append({
-            'step': 0,
-            'description': 'Float32 subtraction',
-            'a_value': a_value,
-            'b_value': b_value,
-            'result_value': result_value,
-            'action': f'Subtract: {a_value} - {b_value} = {result_value}'
-        })
+        steps = []
+        if trace:
+            steps.append({
+                'step': 0,
+                'description': 'Float32 multiplication',
+                'a_value': a_value,
+                'b_value': b_value,
+                'result_value': result_value,
+                'action': f'Multiply: {a_value} * {b_value} = {result_value}'
+            })
         
         return {
-            'result': result_packed['bits'],
-            'flags': result_packed['flags'],
-            'trace': trace
+            'result': result,
+            'flags': flags,
+            'trace': steps
         }
-    
-    def fmul_f32(self, a_bits: list[int], b_bits: list[int]) -> dict:
-        a_unpacked = self.unpack_f32(a_bits)
-        b_unpacked = self.unpack_f32(b_bits)
+
+    def from_bits(self, bits: list[int]) -> float:
+        if len(bits) != 32:
+            raise ValueError("Input must be 32 bits")
         
-        a_value = a_unpacked['value']
-        b_value = b_unpacked['value']
+        return self._unpack_u32(bits_to_uint(bits))
+    
+    def to_bits(self, value: float) -> list[int]:
+        return self.pack_f32(value)['bits']
+    
+    def fadd_val(self, a_value: float, b_value: float) -> float:
+        return _round_f32(a_value + b_value)
+    
+    def fsub_val(self, a_value: float, b_value: float) -> float:
+        return _round_f32(a_value - b_value)
+    
+    def fmul_val(self, a_value: float, b_value: float) -> float:
+        return _round_f32(a_value * b_value)
+
+    def fadd_f32_batch(self, a_words: list[int], b_words: list[int]) -> dict:
+        return self._batch_binop(a_words, b_words, operator.add)
+    
+    def fsub_f32_batch(self, a_words: list[int], b_words: list[int]) -> dict:
+        return self._batch_binop(a_words, b_words, operator.sub)
+    
+    def fmul_f32_batch(self, a_words: list[int], b_words: list[int]) -> dict:
+        return self._batch_binop(a_words, b_words, operator.mul)
+    
+    def _batch_binop(self, a_words: list[int], b_words: list[int], op) -> dict:
+        if len(a_words) != len(b_words):
+            raise ValueError("Operand batches must have the same length")
         
-        result_value = a_value * b_value
+        count = len(a_words)
+        a_values = struct.unpack(f'>{count}f', struct.pack(f'>{count}I', *a_words))
+        b_values = struct.unpack(f'>{count}f', struct.pack(f'>{count}I', *b_words))
+        result_values = list(map(op, a_values, b_values))
         
-        result_packed = self.pack_f32(result_value)
+        try:
+            packed = struct.unpack(f'>{count}I', struct.pack(f'>{count}f', *result_values))
+        except OverflowError:
+            packed = [self._pack_u32(value)[0] for value in result_values]
         
-        trace = []
-        trace.append({
-            'step': 0,
-            'description': 'Float32 multiplication',
-            'a_value': a_value,
-            'b_value': b_value,
-            'result_value': result_value,
-            'action': f'Multiply: {a_value} * {b_value} = {result_value}'
-        })
+        results = []
+        flags = {'overflow': 0, 'underflow': 0, 'invalid': 0, 'inexact': 0}
+        for packed_int in packed:
+            packed_int, word_flags = self._classify_u32(packed_int)
+            results.append(packed_int)
+            for name, value in word_flags.items():
+                flags[name] |= value
         
         return {
-            'result': result_packed['bits'],
-            'flags': result_packed['flags'],
-            'trace': trace
+            'result': results,
+            'flags': flags
         }
 
+def _round_f32(value: float) -> float:
+    try:
+        return _F32.unpack(_F32.pack(value))[0]
+    except OverflowError:
+        return math.copysign(math.inf, value)
+
+@lru_cache(maxsize=4096)
+def _pack_f32_cached(value: float) -> tuple[int, int, int, int, int]:
+    packed_int, flags = Float32._pack_u32(value)
+    return packed_int, flags['overflow'], flags['underflow'], flags['invalid'], flags['inexact']
+
 def test_fpu_f32():
     print("Testing IEEE-754 Float32 Implementation")
     print("=" * 50)
@@ -206,7 +241,7 @@ def test_fpu_f32():
     print("\n3. Testing 0.1 + 0.2:")
     a = fpu.pack_f32(0.1)
     b = fpu.pack_f32(0.2)
-    add_result = fpu.fadd_f32(a['bits'], b['bits'])
+    add_result = fpu.fadd_f32(a['bits'], b['bits'], trace=True)
     add_hex = to_hex_string(add_result['result'])
     
     print(f"  0.1 + 0.2 = {add_hex}")
@@ -2,49 +2,53 @@
 Hex file loader for RISC-V program images
 """
 
-from bit_utils import from_hex_string
+from array import array
+
+from bit_utils import WORD_TYPECODE, bits_to_uint, uint_to_bits, HEX_DIGITS
 
 def load_hex_file(filename: str) -> list[list[int]]:
-    instructions = []
+    return list(as_bitlists(load_hex_words(filename)))
+
+def as_bitlists(words: array):
+    for word in words:
+        yield uint_to_bits(word, 32)
+
+def load_hex_words(filename: str) -> array:
+    words = array(WORD_TYPECODE)
     
     try:
         with open(filename, 'r') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                
-                if not line:
-                    continue
-                
-                if '#' in line:
-                    line = line.split('#')[0].strip()
-                
-                if line.startswith('0x') or line.startswith('0X'):
-                    line = line[2:]
-                
-                if len(line) != 8:
-                    raise ValueError(f"Line {line_num}: Expected 8 hex digits, got {len(line)}: {line}")
-                
-                try:
-                    instruction = from_hex_string('0x' + line, 32)
-                    instructions.append(instruction)
-                except ValueError as e:
-                    raise ValueError(f"Line {line_num}: Invalid hex: {line} - {e}")
+            lines = f.read().splitlines()
+        
+        for line_num, line in enumerate(lines, 1):
+            line = line.strip()
+            
+            if not line:
+                continue
+            
+            if '#' in line:
+                line = line.split('#')[0].strip()
+            
+            if line.startswith('0x') or line.startswith('0X'):
+                line = line[2:]
+            
+            if len(line) != 8:
+                raise ValueError(f"Line {line_num}: Expected 8 hex digits, got {len(line)}: {line}")
+            
+            if line.strip(HEX_DIGITS):
+                char = next(c for c in line if c not in HEX_DIGITS)
+                raise ValueError(f"Line {line_num}: Invalid hex: {line} - Invalid hex character: {char}")
+            
+            words.append(int(line, 16))
     
     except FileNotFoundError:
         raise FileNotFoundError(f"File not found: {filename}")
     except Exception as e:
         raise ValueError(f"Error loading hex file {filename}: {e}")
     
-    return instructions
+    return words
 
-def save_hex_file(filename: str, instructions: list[list[int]]):
-    from bit_utils import to_hex_string
-    
+def save_hex_file(filename: str, instructions: list[list[int]] | array):
     with open(filename, 'w') as f:
-        for instr in instructions:
-            hex_str = to_hex_string(instr)
-            hex_str = hex_str[2:].upper()
-            if len(hex_str) < 8:
-                hex_str = '0' * (8 - len(hex_str)) + hex_str
-            f.write(hex_str + '\n')
-
+        f.write(''.join(f"{instr if isinstance(instr, int) else bits_to_uint(instr):08X}\n"
+                        for instr in instructions))
@@ -2,170 +2,131 @@
 Instruction Decoder for RISC-V RV32I ISA
 """
 
-from bit_utils import bits_to_int, int_to_bits, sign_extend, zero_extend
+from bit_utils import bits_to_uint
+
+def _sign_extend(value: int, width: int) -> int:
+    if value >> (width - 1):
+        return value - (1 << width)
+    return value
+
+_DECODE_CACHE_SIZE = 4096
+
+_TYPES_BY_OPCODE = {
+    0x33: 'R',
+    0x03: 'I',
+    0x13: 'I',
+    0x67: 'I',
+    0x23: 'S',
+    0x63: 'B',
+    0x37: 'U',
+    0x17: 'U',
+    0x6F: 'J',
+}
+
+_NAMES_BY_OPCODE = {
+    0x37: 'LUI',
+    0x17: 'AUIPC',
+    0x6F: 'JAL',
+    0x67: 'JALR',
+}
+
+_NAMES_BY_FUNCT3 = {
+    (0x33, 0x7): 'AND',
+    (0x33, 0x6): 'OR',
+    (0x33, 0x4): 'XOR',
+    (0x33, 0x1): 'SLL',
+    (0x13, 0x0): 'ADDI',
+    (0x13, 0x7): 'ANDI',
+    (0x13, 0x6): 'ORI',
+    (0x13, 0x4): 'XORI',
+    (0x13, 0x1): 'SLLI',
+    (0x03, 0x0): 'LB',
+    (0x03, 0x1): 'LH',
+    (0x03, 0x2): 'LW',
+    (0x23, 0x0): 'SB',
+    (0x23, 0x1): 'SH',
+    (0x23, 0x2): 'SW',
+    (0x63, 0x0): 'BEQ',
+    (0x63, 0x1): 'BNE',
+    (0x63, 0x4): 'BLT',
+    (0x63, 0x5): 'BGE',
+    (0x63, 0x6): 'BLTU',
+    (0x63, 0x7): 'BGEU',
+}
+
+_NAMES_BY_FUNCT7 = {
+    (0x33, 0x0, 0x00): 'ADD',
+    (0x33, 0x0, 0x20): 'SUB',
+    (0x33, 0x5, 0x00): 'SRL',
+    (0x33, 0x5, 0x20): 'SRA',
+    (0x13, 0x5, 0x00): 'SRLI',
+    (0x13, 0x5, 0x20): 'SRAI',
+}
 
 class InstructionDecoder:
     def __init__(self):
-        pass
+        # Decoded fields per instruction word; entries are shared, so callers must not mutate them
+        self._cache = {}
     
     def decode(self, instruction: list[int]) -> dict:
         if len(instruction) != 32:
             raise ValueError(f"Instruction must be 32 bits, got {len(instruction)}")
         
-        opcode = instruction[25:32]
-        opcode_int = bits_to_int(opcode)
-        
-        rd = bits_to_int(instruction[20:25])
-        rs1 = bits_to_int(instruction[12:17])
-        rs2 = bits_to_int(instruction[7:12])
-        
-        funct3 = bits_to_int(instruction[17:20])
-        
-        funct7 = bits_to_int(instruction[0:7])
-        
-        imm_i = instruction[20:32]
-        
-        imm_s = instruction[0:7] + instruction[20:25]
+        return self.decode_u32(bits_to_uint(instruction))
+    
+    def decode_u32(self, instruction: int) -> dict:
+        decoded = self._cache.get(instruction)
+        if decoded is None:
+            if len(self._cache) >= _DECODE_CACHE_SIZE:
+                self._cache.clear()
+            decoded = self._cache[instruction] = self._decode_fields(instruction)
+        
+        return decoded
+    
+    def _decode_fields(self, instruction: int) -> dict:
+        imm_i = _sign_extend(instruction >> 20, 12)
         
-        imm_b = [instruction[31]] + instruction[25:31] + instruction[8:12] + [instruction[7]] + [0]
+        imm_s = _sign_extend(((instruction >> 25) << 5) | ((instruction >> 7) & 0x1F), 12)
         
-        imm_u = instruction[0:20] + [0] * 12
+        imm_b = _sign_extend(((instruction >> 31) << 12)
+                             | (((instruction >> 7) & 0x1) << 11)
+                             | (((instruction >> 25) & 0x3F) << 5)
+                             | (((instruction >> 8) & 0xF) << 1), 13)
         
-        imm_j = [instruction[31]] + instruction[21:31] + [instruction[20]] + instruction[12:20] + [0]
+        imm_u = instruction & 0xFFFFF000
         
-        imm_i_sext = sign_extend(imm_i, 32)
-        imm_s_sext = sign_extend(imm_s, 32)
-        imm_b_sext = sign_extend(imm_b, 32)
-        imm_j_sext = sign_extend(imm_j, 32)
-        imm_u_sext = imm_u
+        imm_j = _sign_extend(((instruction >> 31) << 20)
+                             | (((instruction >> 12) & 0xFF) << 12)
+                             | (((instruction >> 20) & 0x1) << 11)
+                             | (((instruction >> 21) & 0x3FF) << 1), 21)
         
         return {
-            'opcode': opcode,
-            'opcode_int': opcode_int,
-            'rd': rd,
-            'rs1': rs1,
-            'rs2': rs2,
-            'funct3': funct3,
-            'funct7': funct7,
+            'opcode_int': instruction & 0x7F,
+            'rd': (instruction >> 7) & 0x1F,
+            'rs1': (instruction >> 15) & 0x1F,
+            'rs2': (instruction >> 20) & 0x1F,
+            'funct3': (instruction >> 12) & 0x7,
+            'funct7': (instruction >> 25) & 0x7F,
             'imm_i': imm_i,
-            'imm_i_sext': imm_i_sext,
             'imm_s': imm_s,
-            'imm_s_sext': imm_s_sext,
             'imm_b': imm_b,
-            'imm_b_sext': imm_b_sext,
             'imm_u': imm_u,
-            'imm_u_sext': imm_u_sext,
             'imm_j': imm_j,
-            'imm_j_sext': imm_j_sext,
+            'shamt': (instruction >> 20) & 0x1F,
             'instruction': instruction
         }
     
     def get_instruction_type(self, decoded: dict) -> str:
-        opcode = decoded['opcode_int']
-        
-        if opcode == 0x33:
-            return 'R'
-        
-        if opcode in [0x03, 0x13, 0x67]:
-            return 'I'
-        
-        if opcode == 0x23:
-            return 'S'
-        
-        if opcode == 0x63:
-            return 'B'
-        
-        if opcode in [0x37, 0x17]:
-            return 'U'
-        
-        if opcode == 0x6F:
-            return 'J'
-        
-        return 'UNKNOWN'
+        return _TYPES_BY_OPCODE.get(decoded['opcode_int'], 'UNKNOWN')
     
     def get_instruction_name(self, decoded: dict) -> str:
         opcode = decoded['opcode_int']
         funct3 = decoded['funct3']
-        funct7 = decoded['funct7']
-        
-        if opcode == 0x33:
-            if funct3 == 0x0:
-                if funct7 == 0x00:
-                    return 'ADD'
-                elif funct7 == 0x20:
-                    return 'SUB'
-            elif funct3 == 0x7:
-                return 'AND'
-            elif funct3 == 0x6:
-                return 'OR'
-            elif funct3 == 0x4:
-                return 'XOR'
-            elif funct3 == 0x1:
-                return 'SLL'
-            elif funct3 == 0x5:
-                if funct7 == 0x00:
-                    return 'SRL'
-                elif funct7 == 0x20:
-                    return 'SRA'
-        
-        elif opcode == 0x13:
-            if funct3 == 0x0:
-                return 'ADDI'
-            elif funct3 == 0x7:
-                return 'ANDI'
-            elif funct3 == 0x6:
-                return 'ORI'
-            elif funct3 == 0x4:
-                return 'XORI'
-            elif funct3 == 0x1:
-                return 'SLLI'
-            elif funct3 == 0x5:
-                if funct7 == 0x00:
-                    return 'SRLI'
-                elif funct7 == 0x20:
-                    return 'SRAI'
         
-        elif opcode == 0x03:
-            if funct3 == 0x0:
-                return 'LB'
-            elif funct3 == 0x1:
-                return 'LH'
-            elif funct3 == 0x2:
-                return 'LW'
+        name = _NAMES_BY_OPCODE.get(opcode)
+        if name is None:
+            name = _NAMES_BY_FUNCT3.get((opcode, funct3))
+        if name is None:
+            name = _NAMES_BY_FUNCT7.get((opcode, funct3, decoded['funct7']), 'UNKNOWN')
         
-        elif opcode == 0x23:
-            if funct3 == 0x0:
-                return 'SB'
-            elif funct3 == 0x1:
-                return 'SH'
-            elif funct3 == 0x2:
-                return 'SW'
-        
-        elif opcode == 0x63:
-            if funct3 == 0x0:
-                return 'BEQ'
-            elif funct3 == 0x1:
-                return 'BNE'
-            elif funct3 == 0x4:
-                return 'BLT'
-            elif funct3 == 0x5:
-                return 'BGE'
-            elif funct3 == 0x6:
-                return 'BLTU'
-            elif funct3 == 0x7:
-                return 'BGEU'
-        
-        elif opcode == 0x37:
-            return 'LUI'
-        
-        elif opcode == 0x17:
-            return 'AUIPC'
-        
-        elif opcode == 0x6F:
-            return 'JAL'
-        
-        elif opcode == 0x67:
-            return 'JALR'
-        
-        return 'UNKNOWN'
-
+        return name
@@ -2,218 +2,259 @@
 MMDU implementation for RISC-V simulator using Booth's algorithm
 """
 
-from bit_utils import format_bits, to_hex_string, from_hex_string, twos_complement_negate, int_to_bits
-from alu import ALU
+import operator
+
+from bit_utils import format_bits, to_hex_string, from_hex_string, bits_to_int, bits_to_uint, uint_to_bits
+
+# op -> (is_divide, signedness, result index); index 0 is low/quotient, 1 is high/remainder
+_MDU_OPS = {
+    'MUL': (False, (True, True), 0),
+    'MULH': (False, (True, True), 1),
+    'MULHU': (False, (False, False), 1),
+    'MULHSU': (False, (True, False), 1),
+    'DIV': (True, True, 0),
+    'DIVU': (True, False, 0),
+    'REM': (True, True, 1),
+    'REMU': (True, False, 1),
+}
+
+_MUL_FIELDS = ('low', 'high')
+_DIV_FIELDS = ('quotient', 'remainder')
 
 class BoothMultiplier:
     def __init__(self, width: int = 32):
         self.width = width
-        self.alu = ALU(width)
+        self.mask = (1 << width) - 1
+        self.sign_bit = 1 << (width - 1)
     
-    def multiply(self, multiplicand: list[int], multiplier: list[int]) -> dict:
+    def multiply(self, multiplicand: list[int], multiplier: list[int], trace: bool = False,
+                 signedness: tuple[bool, bool] = (True, True)) -> dict:
         if len(multiplicand) != self.width or len(multiplier) != self.width:
             raise ValueError(f"Input vectors must be {self.width} bits")
         
-        from bit_utils import bits_to_int
-        a_int = bits_to_int(multiplicand)
-        b_int = bits_to_int(multiplier)
-        
-        expected_product = a_int * b_int
-        
-        if expected_product < 0:
-            product_64 = expected_product + 2**64
-        else:
-            product_64 = expected_product
+        a_int = bits_to_int(multiplicand) if signedness[0] else bits_to_uint(multiplicand)
+        b_int = bits_to_int(multiplier) if signedness[1] else bits_to_uint(multiplier)
         
-        low_32 = product_64 & 0xFFFFFFFF
-        high_32 = (product_64 >> 32) & 0xFFFFFFFF
+        low_int, high_int, overflow = self.multiply_int(a_int, b_int)
         
-        low_bits = int_to_bits(low_32, self.width)
-        high_bits = int_to_bits(high_32, self.width)
-        
-        overflow = 0
-        if expected_product != bits_to_int(low_bits):
-            overflow = 1
-        
-        trace = []
-        trace.append({
-            'step': 0,
-            'description': 'Direct multiplication',
-            'multiplicand': format_bits(multiplicand, 8),
-            'multiplier': format_bits(multiplier, 8),
-            'expected_product': expected_product,
-            'action': f'Direct calculation: {a_int} * {b_int} = {expected_product}'
-        })
+        steps = []
+        if trace:
+            expected_product = a_int * b_int
+            steps.append({
+                'step': 0,
+                'description': 'Direct multiplication',
+                'multiplicand': format_bits(multiplicand, 8),
+                'multiplier': format_bits(multiplier, 8),
+                'expected_product': expected_product,
+                'action': f'Direct calculation: {a_int} * {b_int} = {expected_product}'
+            })
         
         return {
-            'low': low_bits,
-            'high': high_bits,
+            'low': uint_to_bits(low_int, self.width),
+            'high': uint_to_bits(high_int, self.width),
             'overflow': overflow,
-            'trace': trace
+            'trace': steps
         }
+    
+    def multiply_int(self, a_int: int, b_int: int) -> tuple[int, int, int]:
+        product = a_int * b_int
+        
+        low_int = product & self.mask
+        high_int = (product >> self.width) & self.mask
+        sign = self.sign_bit
+        signed_low = (low_int ^ sign) - sign
+        overflow = int(product != signed_low)
+        
+        return low_int, high_int, overflow
+    
+    def multiply_words(self, a_word: int, b_word: int,
+                       signedness: tuple[bool, bool] = (True, True)) -> tuple[int, int, int]:
+        return self.multiply_int(*self._extend_words(a_word, b_word, signedness))
+    
+    def product_words(self, a_word: int, b_word: int,
+                      signedness: tuple[bool, bool] = (True, True)) -> int:
+        a_int, b_int = self._extend_words(a_word, b_word, signedness)
+        return a_int * b_int
+    
+    def _extend_words(self, a_word: int, b_word: int, signedness: tuple[bool, bool]) -> tuple[int, int]:
+        sign = self.sign_bit
+        if signedness[0]:
+            a_word = (a_word ^ sign) - sign
+        if signedness[1]:
+            b_word = (b_word ^ sign) - sign
+        
+        return a_word, b_word
 
 class RestoringDivider:
     def __init__(self, width: int = 32):
         self.width = width
-        self.alu = ALU(width)
+        self.mask = (1 << width) - 1
+        self.sign_bit = 1 << (width - 1)
     
-    def divide(self, dividend: list[int], divisor: list[int], signed: bool = True) -> dict:
+    def divide(self, dividend: list[int], divisor: list[int], signed: bool = True, trace: bool = False) -> dict:
         if len(dividend) != self.width or len(divisor) != self.width:
             raise ValueError(f"Input vectors must be {self.width} bits")
         
-        from bit_utils import bits_to_int
-        dividend_int = bits_to_int(dividend)
-        divisor_int = bits_to_int(divisor)
-        
-        if divisor_int == 0:
-            if signed:
-                quotient_int = -1
-            else:
-                quotient_int = 0xFFFFFFFF
-            remainder_int = dividend_int
-            
-            quotient = int_to_bits(quotient_int, self.width)
-            remainder = int_to_bits(remainder_int, self.width)
-            
-            return {
-                'quotient': quotient,
-                'remainder': remainder,
-                'overflow': 0,
-                'trace': [{'step': 0, 'description': 'Division by zero', 'quotient': format_bits(quotient, 8), 'remainder': format_bits(remainder, 8), 'action': 'Special case'}]
-            }
-        
-        if signed:
-            int_min = -(2 ** (self.width - 1))
-            minus_one = -1
-            
-            if dividend_int == int_min and divisor_int == minus_one:
-                quotient = int_to_bits(int_min, self.width)
-                remainder = int_to_bits(0, self.width)
-                
-                return {
-                    'quotient': quotient,
-                    'remainder': remainder,
-                    'overflow': 1,
-                    'trace': [{'step': 0, 'description': 'INT_MIN / -1', 'quotient': format_bits(quotient, 8), 'remainder': format_bits(remainder, 8), 'action': 'Special case'}]
-                }
-        
         if signed:
-            if dividend_int >= 0 and divisor_int >= 0:
-                quotient_int = dividend_int // divisor_int
-                remainder_int = dividend_int % divisor_int
-            elif dividend_int >= 0 and divisor_int < 0:
-                quotient_int = -(dividend_int // (-divisor_int))
-                remainder_int = dividend_int % (-divisor_int)
-            elif dividend_int < 0 and divisor_int >= 0:
-                quotient_int = -((-dividend_int) // divisor_int)
-                remainder_int = -((-dividend_int) % divisor_int)
-            else:  # both negative
-                quotient_int = (-dividend_int) // (-divisor_int)
-                remainder_int = -((-dividend_int) % (-divisor_int))
+            dividend_int = bits_to_int(dividend)
+            divisor_int = bits_to_int(divisor)
         else:
-            if dividend_int < 0:
-                dividend_int += 2 ** self.width
-            if divisor_int < 0:
-                divisor_int += 2 ** self.width
-            
-            quotient_int = dividend_int // divisor_int
-            remainder_int = dividend_int % divisor_int
-            
-            if quotient_int >= 2 ** (self.width - 1):
-                quotient_int -= 2 ** self.width
-            if remainder_int >= 2 ** (self.width - 1):
-                remainder_int -= 2 ** self.width
+            dividend_int = bits_to_uint(dividend)
+            divisor_int = bits_to_uint(divisor)
         
-        quotient = int_to_bits(quotient_int, self.width)
-        remainder = int_to_bits(remainder_int, self.width)
+        quotient_int, remainder_int, overflow = self.divide_int(dividend_int, divisor_int, signed)
         
-        trace = []
-        trace.append({
-            'step': 0,
-            'description': 'Direct division',
-            'dividend': format_bits(dividend, 8),
-            'divisor': format_bits(divisor, 8),
-            'quotient': format_bits(quotient, 8),
-            'remainder': format_bits(remainder, 8),
-            'action': f'Direct calculation: {dividend_int} / {divisor_int} = {quotient_int} R {remainder_int}'
-        })
+        quotient = uint_to_bits(quotient_int, self.width)
+        remainder = uint_to_bits(remainder_int, self.width)
+        
+        steps = []
+        if trace:
+            if divisor_int == 0:
+                steps.append({'step': 0, 'description': 'Division by zero', 'quotient': format_bits(quotient, 8), 'remainder': format_bits(remainder, 8), 'action': 'Special case'})
+            elif overflow:
+                steps.append({'step': 0, 'description': 'INT_MIN / -1', 'quotient': format_bits(quotient, 8), 'remainder': format_bits(remainder, 8), 'action': 'Special case'})
+            else:
+                if signed:
+                    quotient_int = bits_to_int(quotient)
+                    remainder_int = bits_to_int(remainder)
+                
+                steps.append({
+                    'step': 0,
+                    'description': 'Direct division',
+                    'dividend': format_bits(dividend, 8),
+                    'divisor': format_bits(divisor, 8),
+                    'quotient': format_bits(quotient, 8),
+                    'remainder': format_bits(remainder, 8),
+                    'action': f'Direct calculation: {dividend_int} / {divisor_int} = {quotient_int} R {remainder_int}'
+                })
         
         return {
             'quotient': quotient,
             'remainder': remainder,
-            'overflow': 0,
-            'trace': trace
+            'overflow': overflow,
+            'trace': steps
         }
+    
+    def divide_int(self, dividend_int: int, divisor_int: int, signed: bool = True) -> tuple[int, int, int]:
+        mask = self.mask
+        dividend_int &= mask
+        divisor_int &= mask
+        
+        if divisor_int == 0:
+            return mask, dividend_int, 0
+        
+        if signed:
+            if dividend_int == self.sign_bit and divisor_int == mask:
+                return self.sign_bit, 0, 1
+            
+            sign = self.sign_bit
+            dividend_int = (dividend_int ^ sign) - sign
+            divisor_int = (divisor_int ^ sign) - sign
+            
+            quotient_int, remainder_int = divmod(abs(dividend_int), abs(divisor_int))
+            if (dividend_int < 0) != (divisor_int < 0):
+                quotient_int = -quotient_int
+            if dividend_int < 0:
+                remainder_int = -remainder_int
+            
+            return quotient_int & mask, remainder_int & mask, 0
+        
+        quotient_int, remainder_int = divmod(dividend_int, divisor_int)
+        return quotient_int, remainder_int, 0
 
 class MultiplyDivideUnit:
-    def __init__(self, width: int = 32):
+    def __init__(self, width: int = 32, trace: bool = False):
         self.width = width
+        self.trace = trace
         self.multiplier = BoothMultiplier(width)
         self.divider = RestoringDivider(width)
     
-    def mul(self, rs1: list[int], rs2: list[int]) -> dict:
-        result = self.multiplier.multiply(rs1, rs2)
-        return {
-            'rd': result['low'],
-            'overflow': result['overflow'],
-            'trace': result['trace']
-        }
+    def mul(self, rs1: list[int], rs2: list[int], trace: bool = False) -> dict:
+        return self.execute(rs1, rs2, 'MUL', trace)
     
-    def mulh(self, rs1: list[int], rs2: list[int]) -> dict:
-        result = self.multiplier.multiply(rs1, rs2)
-        return {
-            'rd': result['high'],
-            'overflow': result['overflow'],
-            'trace': result['trace']
-        }
+    def mulh(self, rs1: list[int], rs2: list[int], trace: bool = False) -> dict:
+        return self.execute(rs1, rs2, 'MULH', trace)
 
-    def mulhu(self, rs1: list[int], rs2: list[int]) -> dict:
-        result = self.multiplier.multiply(rs1, rs2)
-        return {
-            'rd': result['high'],
-            'overflow': result['overflow'],
-            'trace': result['trace']
-        }
+    def mulhu(self, rs1: list[int], rs2: list[int], trace: bool = False) -> dict:
+        return self.execute(rs1, rs2, 'MULHU', trace)
     
-    def mulhsu(self, rs1: list[int], rs2: list[int]) -> dict:
-        result = self.multiplier.multiply(rs1, rs2)
-        return {
-            'rd': result['high'],
-            'overflow': result['overflow'],
-            'trace': result['trace']
-        }
+    def mulhsu(self, rs1: list[int], rs2: list[int], trace: bool = False) -> dict:
+        return self.execute(rs1, rs2, 'MULHSU', trace)
     
-    def div(self, rs1: list[int], rs2: list[int]) -> dict:
-        result = self.divider.divide(rs1, rs2, signed=True)
+    def execute(self, rs1: list[int], rs2: list[int], op: str, trace: bool = False) -> dict:
+        is_divide, signedness, index = self._lookup(op)
+        
+        if is_divide:
+            result = self.divider.divide(rs1, rs2, signed=signedness, trace=trace or self.trace)
+            field = _DIV_FIELDS[index]
+        else:
+            result = self.multiplier.multiply(rs1, rs2, trace or self.trace, signedness)
+            field = _MUL_FIELDS[index]
+        
         return {
-            'rd': result['quotient'],
+            'rd': result[field],
             'overflow': result['overflow'],
             'trace': result['trace']
         }
     
-    def divu(self, rs1: list[int], rs2: list[int]) -> dict:
-        result = self.divider.divide(rs1, rs2, signed=False)
-        return {
-            'rd': result['quotient'],
-            'overflow': result['overflow'],
-            'trace': result['trace']
-        }
+    def execute_int(self, a: int, b: int, op: str) -> int:
+        is_divide, signedness, index = self._lookup(op)
+        
+        if is_divide:
+            return self.divider.divide_int(a, b, signedness)[index]
+        
+        product = self.multiplier.product_words(a, b, signedness)
+        return (product >> (self.width * index)) & self.multiplier.mask
     
-    def rem(self, rs1: list[int], rs2: list[int]) -> dict:
-        result = self.divider.divide(rs1, rs2, signed=True)
-        return {
-            'rd': result['remainder'],
-            'overflow': result['overflow'],
-            'trace': result['trace']
-        }
+    def _lookup(self, op: str) -> tuple:
+        try:
+            return _MDU_OPS[op]
+        except KeyError:
+            raise ValueError(f"Unsupported MDU operation: {op}") from None
     
-    def remu(self, rs1: list[int], rs2: list[int]) -> dict:
-        result = self.divider.divide(rs1, rs2, signed=False)
-        return {
-            'rd': result['remainder'],
-            'overflow': result['overflow'],
-            'trace': result['trace']
-        }
+    def mul_batch(self, rs1_words: list[int], rs2_words: list[int]) -> list[int]:
+        products = self._batch_products(rs1_words, rs2_words, True, True)
+        mask = self.multiplier.mask
+        return [product & mask for product in products]
+    
+    def mulh_batch(self, rs1_words: list[int], rs2_words: list[int]) -> list[int]:
+        return self._batch_high(self._batch_products(rs1_words, rs2_words, True, True))
+    
+    def mulhu_batch(self, rs1_words: list[int], rs2_words: list[int]) -> list[int]:
+        return self._batch_high(self._batch_products(rs1_words, rs2_words, False, False))
+    
+    def mulhsu_batch(self, rs1_words: list[int], rs2_words: list[int]) -> list[int]:
+        return self._batch_high(self._batch_products(rs1_words, rs2_words, True, False))
+    
+    def _batch_products(self, rs1_words: list[int], rs2_words: list[int],
+                        rs1_signed: bool, rs2_signed: bool) -> list[int]:
+        if len(rs1_words) != len(rs2_words):
+            raise ValueError("Operand batches must have the same length")
+        
+        sign = self.multiplier.sign_bit
+        if rs1_signed:
+            rs1_words = [(word ^ sign) - sign for word in rs1_words]
+        if rs2_signed:
+            rs2_words = [(word ^ sign) - sign for word in rs2_words]
+        
+        return list(map(operator.mul, rs1_words, rs2_words))
+    
+    def _batch_high(self, products: list[int]) -> list[int]:
+        width = self.width
+        mask = self.multiplier.mask
+        return [(product >> width) & mask for product in products]
+    
+    def div(self, rs1: list[int], rs2: list[int], trace: bool = False) -> dict:
+        return self.execute(rs1, rs2, 'DIV', trace)
+    
+    def divu(self, rs1: list[int], rs2: list[int], trace: bool = False) -> dict:
+        return self.execute(rs1, rs2, 'DIVU', trace)
+    
+    def rem(self, rs1: list[int], rs2: list[int], trace: bool = False) -> dict:
+        return self.execute(rs1, rs2, 'REM', trace)
+    
+    def remu(self, rs1: list[int], rs2: list[int], trace: bool = False) -> dict:
+        return self.execute(rs1, rs2, 'REMU', trace)
 
 def test_mdu():
     print("Testing Multiply/Divide Unit")
@@ -225,7 +266,7 @@ def test_mdu():
     rs1 = from_hex_string("0x12345678", 32)
     rs2 = from_hex_string("0xFEDCBA87", 32)
     
-    result = mdu.mul(rs1, rs2)
+    result = mdu.mul(rs1, rs2, trace=True)
     result_hex = to_hex_string(result['rd'])
     
     print(f"  MUL 0x12345678 * 0xFEDCBA87")
@@ -2,32 +2,51 @@
 Memory units for RISC-V CPU simulator
 """
 
-from bit_utils import bits_to_int, int_to_bits, to_hex_string, from_hex_string
+from array import array
+
+from bit_utils import WORD_TYPECODE, bits_to_uint, uint_to_bits
+
+_BYTE_SHIFTS = (0, 8, 16, 24)
+_BYTE_MASKS = tuple(0xFF << shift for shift in _BYTE_SHIFTS)
 
 class InstructionMemory:
     def __init__(self, size: int = 1024, base_address: int = 0x00000000):
         self.size = size
         self.base_address = base_address
-        self.memory = {}
+        self.memory = array(WORD_TYPECODE, [0]) * ((size + 3) // 4)
     
-    def load_program(self, instructions: list[list[int]], start_address: int = None):
+    def load_program(self, instructions: list[list[int]] | array, start_address: int = None):
         if start_address is None:
             start_address = self.base_address
         
+        if start_address % 4 != 0:
+            raise ValueError(f"Unaligned program address {hex(start_address)}")
+        
         for i, instr in enumerate(instructions):
             addr = start_address + (i * 4)
             if addr < self.base_address or addr >= self.base_address + self.size:
                 raise ValueError(f"Address {hex(addr)} out of bounds")
-            self.memory[addr] = instr
+            self.memory[(addr - self.base_address) >> 2] = instr if isinstance(instr, int) else bits_to_uint(instr)
     
     def read(self, address: int) -> list[int]:
+        return uint_to_bits(self.read_int(address), 32)
+    
+    def read_int(self, address: int) -> int:
         if address % 4 != 0:
             raise ValueError(f"Unaligned instruction fetch at address {hex(address)}")
         
-        if address in self.memory:
-            return self.memory[address][:]
-        else:
-            return [0] * 32
+        index = (address - self.base_address) >> 2
+        if 0 <= index < len(self.memory):
+            return self.memory[index]
+        return 0
+    
+    def clear(self):
+        self.memory[:] = array(WORD_TYPECODE, [0]) * len(self.memory)
+    
+    def loaded_words(self):
+        for index, word in enumerate(self.memory):
+            if word:
+                yield self.base_address + index * 4, word
     
     def get_size(self) -> int:
         return self.size
@@ -39,52 +58,71 @@ class DataMemory:
     def __init__(self, size: int = 1024, base_address: int = 0x00010000):
         self.size = size
         self.base_address = base_address
-        self.memory = {}
+        self.memory = array(WORD_TYPECODE, [0]) * ((size + 3) // 4)
+        self.written = bytearray(len(self.memory))
     
     def read_word(self, address: int) -> list[int]:
+        return uint_to_bits(self.read_word_int(address), 32)
+    
+    def read_word_int(self, address: int) -> int:
         if address % 4 != 0:
             raise ValueError(f"Unaligned word read at address {hex(address)}")
         
-        if address < self.base_address or address >= self.base_address + self.size:
+        if address < self.base_address or address + 4 > self.base_address + self.size:
             raise ValueError(f"Address {hex(address)} out of bounds")
         
-        if address in self.memory:
-            return self.memory[address][:]
-        else:
-            return [0] * 32
+        return self.memory[(address - self.base_address) >> 2]
     
     def write_word(self, address: int, data: list[int]):
         if len(data) != 32:
             raise ValueError(f"Data must be 32 bits, got {len(data)}")
         
+        self.write_word_int(address, bits_to_uint(data))
+    
+    def write_word_int(self, address: int, value: int):
         if address % 4 != 0:
             raise ValueError(f"Unaligned word write at address {hex(address)}")
         
-        if address < self.base_address or address >= self.base_address + self.size:
+        if address < self.base_address or address + 4 > self.base_address + self.size:
             raise ValueError(f"Address {hex(address)} out of bounds")
         
-        self.memory[address] = data[:]
+        index = (address - self.base_address) >> 2
+        self.memory[index] = value & 0xFFFFFFFF
+        self.written[index] = 1
     
     def read_byte(self, address: int) -> list[int]:
-        word_addr = (address // 4) * 4
-        byte_offset = address % 4
+        index = self._word_index(address & ~3)
         
-        word = self.read_word(word_addr)
-        byte_bits = word[24 - byte_offset * 8:32 - byte_offset * 8]
-        
-        return [0] * 24 + byte_bits
+        return uint_to_bits((self.memory[index] >> _BYTE_SHIFTS[address & 3]) & 0xFF, 32)
     
     def write_byte(self, address: int, data: list[int]):
         if len(data) != 8:
             raise ValueError(f"Data must be 8 bits, got {len(data)}")
         
-        word_addr = (address // 4) * 4
-        byte_offset = address % 4
+        index = self._word_index(address & ~3)
+        offset = address & 3
         
-        word = self.read_word(word_addr)
-        word[24 - byte_offset * 8:32 - byte_offset * 8] = data
+        self.memory[index] = (self.memory[index] & ~_BYTE_MASKS[offset]) | (bits_to_uint(data) << _BYTE_SHIFTS[offset])
+        self.written[index] = 1
+    
+    def is_written(self, address: int) -> bool:
+        if address % 4 != 0:
+            raise ValueError(f"Unaligned word address {hex(address)}")
+        
+        if address < self.base_address or address + 4 > self.base_address + self.size:
+            raise ValueError(f"Address {hex(address)} out of bounds")
+        
+        return bool(self.written[(address - self.base_address) >> 2])
+    
+    def _word_index(self, word_addr: int) -> int:
+        if word_addr < self.base_address or word_addr + 4 > self.base_address + self.size:
+            raise ValueError(f"Address {hex(word_addr)} out of bounds")
         
-        self.write_word(word_addr, word)
+        return (word_addr - self.base_address) >> 2
+    
+    def clear(self):
+        self.memory[:] = array(WORD_TYPECODE, [0]) * len(self.memory)
+        self.written[:] = bytes(len(self.written))
     
     def get_size(self) -> int:
         return self.size
@@ -99,9 +137,15 @@ class DataMemory:
             end_addr = self.base_address + self.size
         
         dump = {}
-        for addr in range(start_addr, end_addr, 4):
-            if addr in self.memory:
-                dump[hex(addr)] = to_hex_string(self.memory[addr])
+        if start_addr % 4 != 0:
+            # Words are only stored at aligned addresses, so an unaligned walk matches none
+            return dump
+        
+        start = max(start_addr, self.base_address) - self.base_address
+        end = min(end_addr, self.base_address + self.size) - self.base_address
+        
+        for offset in range(start, end, 4):
+            if self.written[offset >> 2]:
+                dump[f"0x{self.base_address + offset:08x}"] = f"0x{self.memory[offset >> 2]:08X}"
         
         return dump
-
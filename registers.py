@@ -2,125 +2,153 @@
 Register and Register File implementation for RISC-V simulator.
 """
 
-from bit_utils import int_to_bits, bits_to_int, format_bits
+from bit_utils import bits_to_uint, uint_to_bits, format_bits
 
 class Reg:
     
     def __init__(self, width: int = 32):
         self.width = width
-        self.data = [0] * width
+        self.mask = (1 << width) - 1
+        self.data = 0
         self.load_enable = False
         self.clear_enable = False
     
-    def load(self, data: list[int], enable: bool = True):
+    def load(self, data: list[int] | int, enable: bool = True):
         self.load_enable = enable
-        if enable and len(data) == self.width:
-            self.data = data[:]
-        elif enable:
-            if len(data) < self.width:
-                self.data = [0] * (self.width - len(data)) + data
-            else:
-                self.data = data[-self.width:]
+        if enable:
+            if not isinstance(data, int):
+                data = bits_to_uint(data)
+            self.data = data & self.mask
     
     def clear(self, enable: bool = True):
         self.clear_enable = enable
         if enable:
-            self.data = [0] * self.width
+            self.data = 0
     
     def read(self) -> list[int]:
-        return self.data[:]
+        return uint_to_bits(self.data, self.width)
+    
+    def read_int(self) -> int:
+        return self.data
     
     def clock_edge(self):
         if self.clear_enable:
-            self.data = [0] * self.width
+            self.data = 0
             self.clear_enable = False
         elif self.load_enable:
             self.load_enable = False
     
     def __str__(self) -> str:
-        return f"Reg({self.width}): {format_bits(self.data)}"
+        return f"Reg({self.width}): {format_bits(self.read())}"
+
+class _RegisterView:
+    
+    def __init__(self, reg_file: "RegisterFile", index: int):
+        self.reg_file = reg_file
+        self.index = index
+        self.width = reg_file.width
+    
+    def load(self, data: list[int] | int, enable: bool = True):
+        if enable:
+            if not isinstance(data, int):
+                data = bits_to_uint(data)
+            self.reg_file.values[self.index] = data & self.reg_file.mask
+    
+    def clear(self, enable: bool = True):
+        if enable:
+            self.reg_file.values[self.index] = 0
+    
+    def read(self) -> list[int]:
+        return uint_to_bits(self.reg_file.values[self.index], self.width)
+    
+    def read_int(self) -> int:
+        return self.reg_file.values[self.index]
+    
+    def clock_edge(self):
+        pass
+    
+    def __str__(self) -> str:
+        return f"Reg({self.width}): {format_bits(self.read())}"
 
 class RegisterFile:
     def __init__(self, num_regs: int = 32, width: int = 32):
         self.num_regs = num_regs
         self.width = width
-        self.registers = [Reg(width) for _ in range(num_regs)]
-        
-        for reg in self.registers:
-            reg.data = [0] * width
+        self.mask = (1 << width) - 1
+        self.values = [0] * num_regs
+        self.names = tuple(f"x{i}" for i in range(num_regs))
+    
+    @property
+    def registers(self) -> tuple[_RegisterView, ...]:
+        # Per-register handles kept for callers of the old Reg-based layout
+        return tuple(_RegisterView(self, i) for i in range(self.num_regs))
     
     def read(self, addr: int) -> list[int]:
+        return uint_to_bits(self.read_int(addr), self.width)
+    
+    def read_int(self, addr: int) -> int:
         if 0 <= addr < self.num_regs:
-            return self.registers[addr].read()
+            return self.values[addr]
         else:
             raise ValueError(f"Invalid register address: {addr}")
     
     def write(self, addr: int, data: list[int], enable: bool = True):
+        self.write_int(addr, bits_to_uint(data), enable)
+    
+    def write_int(self, addr: int, value: int, enable: bool = True):
         if addr == 0:
             return
         
         if 0 <= addr < self.num_regs:
-            self.registers[addr].load(data, enable)
+            if enable:
+                self.values[addr] = value & self.mask
         else:
             raise ValueError(f"Invalid register address: {addr}")
     
     def clock_edge(self):
-        for reg in self.registers:
-            reg.clock_edge()
+        pass
+    
+    def clear(self):
+        self.values[:] = [0] * self.num_regs
     
     def get_register_names(self) -> list[str]:
-        return [f"x{i}" for i in range(self.num_regs)]
+        return list(self.names)
     
     def dump_registers(self) -> dict:
-        dump = {}
-        for i, reg in enumerate(self.registers):
-            dump[f"x{i}"] = reg.read()
-        return dump
+        width = self.width
+        return {name: uint_to_bits(value, width) for name, value in zip(self.names, self.values)}
+    
+    def dump_registers_int(self) -> dict:
+        return dict(zip(self.names, self.values))
     
     def __str__(self) -> str:
         lines = ["Register File:"]
-        for i, reg in enumerate(self.registers):
-            lines.append(f"  x{i:2d}: {format_bits(reg.data)}")
+        for i, value in enumerate(self.values):
+            lines.append(f"  x{i:2d}: {format_bits(uint_to_bits(value, self.width))}")
         return "\n".join(lines)
 
-class FPRegisterFile:
+class FPRegisterFile(RegisterFile):
     def __init__(self, num_regs: int = 32, width: int = 32):
-        self.num_regs = num_regs
-        self.width = width
-        self.registers = [Reg(width) for _ in range(num_regs)]
-        
-        for reg in self.registers:
-            reg.data = [0] * width
-
-    def read(self, addr: int) -> list[int]:
+        super().__init__(num_regs, width)
+        self.names = tuple(f"f{i}" for i in range(num_regs))
+    
+    def read_int(self, addr: int) -> int:
         if 0 <= addr < self.num_regs:
-            return self.registers[addr].read()
+            return self.values[addr]
         else:
             raise ValueError(f"Invalid FP register address: {addr}")
     
-    def write(self, addr: int, data: list[int], enable: bool = True):
+    def write_int(self, addr: int, value: int, enable: bool = True):
         if 0 <= addr < self.num_regs:
-            self.registers[addr].load(data, enable)
+            if enable:
+                self.values[addr] = value & self.mask
         else:
             raise ValueError(f"Invalid FP register address: {addr}")
     
-    def clock_edge(self):
-        for reg in self.registers:
-            reg.clock_edge()
-    
-    def get_register_names(self) -> list[str]:
-        return [f"f{i}" for i in range(self.num_regs)]
-    
-    def dump_registers(self) -> dict:
-        dump = {}
-        for i, reg in enumerate(self.registers):
-            dump[f"f{i}"] = reg.read()
-        return dump
-    
     def __str__(self) -> str:
         lines = ["FP Register File:"]
-        for i, reg in enumerate(self.registers):
-            lines.append(f"  f{i:2d}: {format_bits(reg.data)}")
+        for i, value in enumerate(self.values):
+            lines.append(f"  f{i:2d}: {format_bits(uint_to_bits(value, self.width))}")
         return "\n".join(lines)
 
 def test_registers():
@@ -2,13 +2,14 @@
 Main runner for RISC-V CPU simulator
 """
 
+import sys
+import traceback
+
 from cpu import CPU
-from hex_loader import load_hex_file
-from bit_utils import bits_to_int, to_hex_string
+from hex_loader import load_hex_words
+from bit_utils import uint_to_int, int_to_hex_string
 
 def main():
-    import sys
-    
     if len(sys.argv) < 2:
         print("Usage: python run_cpu.py <hex_file> [verbose]")
         print("Example: python run_cpu.py prog.hex")
@@ -19,7 +20,7 @@ def main():
     
     try:
         print(f"Loading program from {hex_file}...")
-        instructions = load_hex_file(hex_file)
+        instructions = load_hex_words(hex_file)
         print(f"Loaded {len(instructions)} instructions")
         
         cpu = CPU()
@@ -38,17 +39,17 @@ def main():
         print(f"Halted: {stats['halted']}")
         print(f"Final PC: {hex(stats['final_pc'])}")
         
-        state = cpu.get_state()
+        state = cpu.get_state_int()
         regs = state['registers']
         
         print(f"\n{'='*60}")
         print("Final Register State (non-zero registers)")
         print(f"{'='*60}")
         for reg_name in sorted(regs.keys()):
-            reg_val = bits_to_int(regs[reg_name])
-            reg_hex = to_hex_string(regs[reg_name])
-            if reg_val != 0 or reg_name == 'x0':
-                print(f"  {reg_name}: {reg_hex} ({reg_val})")
+            reg_val = uint_to_int(regs[reg_name])
+            if reg_val == 0 and reg_name != 'x0':
+                continue
+            print(f"  {reg_name}: {int_to_hex_string(reg_val)} ({reg_val})")
         
         mem = state['data_memory']
         if mem:
@@ -62,7 +63,6 @@ def main():
         print(f"Error: File '{hex_file}' not found")
     except Exception as e:
         print(f"Error: {e}")
-        import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
@@ -2,76 +2,101 @@
 Barrel Shifter implementation for RISC-V simulator
 """
 
-from bit_utils import format_bits
+from bit_utils import format_bits, bits_to_uint, uint_to_bits, from_hex_string, to_hex_string
+
+_SHAMT_BITS = tuple(uint_to_bits(amount, 5) for amount in range(32))
+
+def _make_shift_ops(width: int) -> dict:
+    mask = (1 << width) - 1
+    sign = 1 << (width - 1)
+    
+    def sll(value: int, shift_amount: int) -> int:
+        return (value << shift_amount) & mask
+    
+    def srl(value: int, shift_amount: int) -> int:
+        return value >> shift_amount
+    
+    def sra(value: int, shift_amount: int) -> int:
+        return (((value ^ sign) - sign) >> shift_amount) & mask
+    
+    return {'SLL': sll, 'SRL': srl, 'SRA': sra}
 
 class BarrelShifter:
     def __init__(self, width: int = 32):
         self.width = width
+        self.mask = (1 << width) - 1
+        self.sign_bit = 1 << (width - 1)
+        self._ops = _make_shift_ops(width)
     
-    def shift_left_logical(self, data: list[int], shift_amount: int) -> list[int]:
-        if len(data) != self.width:
-            raise ValueError(f"Input vector must be {self.width} bits")
+    def shift_int(self, value: int, shift_amount: int, operation: str) -> int:
+        try:
+            op = self._ops[operation]
+        except KeyError:
+            raise ValueError(f"Unsupported shift operation: {operation}") from None
         
-        if shift_amount >= self.width:
-            return [0] * self.width
+        if shift_amount < 0:
+            shift_amount = 0
+        elif shift_amount > self.width:
+            shift_amount = self.width
         
-        if shift_amount <= 0:
-            return data[:]
-        
-        result = data[shift_amount:] + [0] * shift_amount
-        return result
+        return op(value, shift_amount)
+    
+    def shift_left_logical(self, data: list[int], shift_amount: int) -> list[int]:
+        return self._shift_bits(data, shift_amount, 'SLL')
     
     def shift_right_logical(self, data: list[int], shift_amount: int) -> list[int]:
-        if len(data) != self.width:
-            raise ValueError(f"Input vector must be {self.width} bits")
-        
-        if shift_amount >= self.width:
-            return [0] * self.width
-        
-        if shift_amount <= 0:
-            return data[:]
-        
-        result = [0] * shift_amount + data[:-shift_amount]
-        return result
+        return self._shift_bits(data, shift_amount, 'SRL')
     
     def shift_right_arithmetic(self, data: list[int], shift_amount: int) -> list[int]:
+        return self._shift_bits(data, shift_amount, 'SRA')
+    
+    def _shift_bits(self, data: list[int], shift_amount: int, operation: str) -> list[int]:
         if len(data) != self.width:
             raise ValueError(f"Input vector must be {self.width} bits")
         
-        if shift_amount >= self.width:
-            sign_bit = data[0]
-            return [sign_bit] * self.width
-        
-        if shift_amount <= 0:
-            return data[:]
-        
-        sign_bit = data[0]
-        result = [sign_bit] * shift_amount + data[:-shift_amount]
-        return result
+        return uint_to_bits(self.shift_int(bits_to_uint(data), shift_amount, operation), self.width)
     
     def shift(self, data: list[int], shift_amount: int, operation: str) -> list[int]:
-        if operation == 'SLL':
-            return self.shift_left_logical(data, shift_amount)
-        elif operation == 'SRL':
-            return self.shift_right_logical(data, shift_amount)
-        elif operation == 'SRA':
-            return self.shift_right_arithmetic(data, shift_amount)
-        else:
-            raise ValueError(f"Unsupported shift operation: {operation}")
+        return self._shift_bits(data, shift_amount, operation)
 
 class Shifter:
     def __init__(self, width: int = 32):
         self.width = width
+        self.mask = (1 << width) - 1
         self.barrel_shifter = BarrelShifter(width)
+        self._ops = _make_shift_ops(width)
+        
+        # A five-bit shift amount never reaches the width, so skip the clamp
+        if width > 0x1F:
+            self.execute_int = self._execute_int_wide
     
     def execute(self, data: list[int], shift_amount_bits: list[int], operation: str) -> list[int]:
-        shift_amount = 0
-        for i, bit in enumerate(shift_amount_bits):
-            shift_amount += bit * (2 ** (len(shift_amount_bits) - 1 - i))
-        
-        shift_amount = shift_amount & 0x1F
+        shift_amount = bits_to_uint(shift_amount_bits[-5:])
         
         return self.barrel_shifter.shift(data, shift_amount, operation)
+    
+    def execute_int(self, value: int, shift_amount: int, operation: str) -> int:
+        return self.barrel_shifter.shift_int(value, shift_amount & 0x1F, operation)
+    
+    def execute_batch(self, values: list[int], shift_amounts: list[int], operation: str) -> list[int]:
+        if len(values) != len(shift_amounts):
+            raise ValueError("Operand batches must have the same length")
+        
+        try:
+            op = self._ops[operation]
+        except KeyError:
+            raise ValueError(f"Unsupported shift operation: {operation}") from None
+        
+        width = self.width
+        return list(map(op, values, [min(amount & 0x1F, width) for amount in shift_amounts]))
+    
+    def _execute_int_wide(self, value: int, shift_amount: int, operation: str) -> int:
+        try:
+            op = self._ops[operation]
+        except KeyError:
+            raise ValueError(f"Unsupported shift operation: {operation}") from None
+        
+        return op(value, shift_amount & 0x1F)
 
 def test_shifter():
 
@@ -99,9 +124,8 @@ def test_shifter():
     for data_hex, shift_amount, operation, expected_result_hex, description in test_cases:
         print(f"\n{description}")
         
-        from bit_utils import from_hex_string, to_hex_string
         data_bits = from_hex_string(data_hex, 8)
-        shift_amount_bits = [int(bit) for bit in format(shift_amount, '05b')]
+        shift_amount_bits = _SHAMT_BITS[shift_amount]
         
         result = shifter.execute(data_bits, shift_amount_bits, operation)
         result_hex = to_hex_string(result)
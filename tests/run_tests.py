@@ -5,40 +5,82 @@ Test runner for RISC-V, runs all unit tests
 import unittest
 import sys
 import os
+import io
 import time
+from traceback import format_exc
+from concurrent.futures import ProcessPoolExecutor
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(_TESTS_DIR))
 
-def run_all_tests():
-    print("RISC-V Unit Test")
-    print("=" * 60)
-    print()
-    
-    loader = unittest.TestLoader()
-    start_dir = os.path.dirname(os.path.abspath(__file__))
-    suite = loader.discover(start_dir, pattern='test_*.py')
-    
+def _run_module(module_name):
+    if _TESTS_DIR not in sys.path:
+        sys.path.insert(0, _TESTS_DIR)
+    
+    try:
+        suite = unittest.TestLoader().loadTestsFromName(module_name)
+    except Exception:
+        # Report a module that fails to import as one errored test, like discover() does
+        return {
+            'output': f"Failed to load test module {module_name}\n",
+            'tests_run': 1,
+            'failures': [],
+            'errors': [(f"unittest.loader._FailedTest.{module_name}", format_exc())],
+            'skipped': 0,
+        }
+    
+    stream = io.StringIO()
     runner = unittest.TextTestRunner(
+        stream=stream,
         verbosity=2,
         descriptions=True,
         failfast=False
     )
+    result = runner.run(suite)
+    
+    return {
+        'output': stream.getvalue(),
+        'tests_run': result.testsRun,
+        'failures': [(str(test), traceback) for test, traceback in result.failures],
+        'errors': [(str(test), traceback) for test, traceback in result.errors],
+        'skipped': len(result.skipped),
+    }
+
+def run_all_tests(parallel=True, quiet=False):
+    print("RISC-V Unit Test")
+    print("=" * 60)
+    print()
+    
+    modules = sorted(name[:-3] for name in os.listdir(_TESTS_DIR)
+                     if name.startswith('test_') and name.endswith('.py'))
     
     print("Running all unit tests...")
     print("-" * 40)
     
     start_time = time.time()
-    result = runner.run(suite)
+    if parallel and len(modules) > 1:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            module_results = list(pool.map(_run_module, modules))
+    else:
+        module_results = [_run_module(name) for name in modules]
     end_time = time.time()
     
+    for module_result in module_results:
+        if quiet and not (module_result['failures'] or module_result['errors']):
+            continue
+        print(module_result['output'])
+    
+    result_failures = [item for module_result in module_results for item in module_result['failures']]
+    result_errors = [item for module_result in module_results for item in module_result['errors']]
+    
     print("\n" + "=" * 60)
     print("TEST SUMMARY")
     print("=" * 60)
     
-    total_tests = result.testsRun
-    failures = len(result.failures)
-    errors = len(result.errors)
-    skipped = len(result.skipped) if hasattr(result, 'skipped') else 0
+    total_tests = sum(module_result['tests_run'] for module_result in module_results)
+    failures = len(result_failures)
+    errors = len(result_errors)
+    skipped = sum(module_result['skipped'] for module_result in module_results)
     passed = total_tests - failures - errors - skipped
     
     print(f"Total Tests: {total_tests}")
@@ -53,7 +95,7 @@ def run_all_tests():
         print("\n" + "=" * 60)
         print("FAILURES")
         print("=" * 60)
-        for test, traceback in result.failures:
+        for test, traceback in result_failures:
             print(f"\nFAILED: {test}")
             print("-" * 40)
             print(traceback)
@@ -62,7 +104,7 @@ def run_all_tests():
         print("\n" + "=" * 60)
         print("ERRORS")
         print("=" * 60)
-        for test, traceback in result.errors:
+        for test, traceback in result_errors:
             print(f"\nERROR: {test}")
             print("-" * 40)
             print(traceback)
@@ -79,7 +121,7 @@ def run_all_tests():
     ]
     
     for component_name, test_file in components:
-        test_path = os.path.join(start_dir, test_file)
+        test_path = os.path.join(_TESTS_DIR, test_file)
         if os.path.exists(test_path):
             print(f"{component_name}: {test_file}")
         else:
@@ -104,11 +146,14 @@ def run_specific_test(test_name):
     return result.wasSuccessful()
 
 def main():
-    if len(sys.argv) > 1:
-        test_name = sys.argv[1]
-        success = run_specific_test(test_name)
+    flags = {arg for arg in sys.argv[1:] if arg.startswith('-')}
+    names = [arg for arg in sys.argv[1:] if not arg.startswith('-')]
+    
+    if names:
+        success = run_specific_test(names[0])
     else:
-        success = run_all_tests()
+        success = run_all_tests(parallel='--serial' not in flags,
+                                quiet='-q' in flags or '--quiet' in flags)
     
     sys.exit(0 if success else 1)
 
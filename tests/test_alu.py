@@ -8,67 +8,53 @@ import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from alu import ALU
-from bit_utils import from_hex_string, to_hex_string, bits_to_int
+from alu import ALU, RippleCarryAdder
+from bit_utils import from_hex_string, to_hex_string, bits_to_int, bits_to_uint
+
+_OVERFLOW_CASES = [
+    ('ADD', "0x7FFFFFFF", "0x00000001", "0x80000000", 
+     {'N': 1, 'Z': 0, 'C': 0, 'V': 1}, "INT_MAX + 1"),
+    ('ADD', "0xFFFFFFFF", "0xFFFFFFFF", "0xFFFFFFFE", 
+     {'N': 1, 'Z': 0, 'C': 1, 'V': 0}, "-1 + -1"),
+    ('ADD', "0x0000000D", "0xFFFFFFF3", "0x00000000", 
+     {'N': 0, 'Z': 1, 'C': 1, 'V': 0}, "13 + -13"),
+    ('SUB', "0x80000000", "0x00000001", "0x7FFFFFFF", 
+     {'N': 0, 'Z': 0, 'C': 1, 'V': 1}, "INT_MIN - 1"),
+    ('SUB', "0x0000000D", "0x00000007", "0x00000006", 
+     {'N': 0, 'Z': 0, 'C': 1, 'V': 0}, "13 - 7"),
+    ('SUB', "0x00000000", "0x00000001", "0xFFFFFFFF", 
+     {'N': 1, 'Z': 0, 'C': 0, 'V': 0}, "0 - 1"),
+]
+
+_ZERO = from_hex_string("0x00000000", 32)
+_ONE = from_hex_string("0x00000001", 32)
+_MINUS1 = from_hex_string("0xFFFFFFFF", 32)
+_INTMAX = from_hex_string("0x7FFFFFFF", 32)
+_POS13 = from_hex_string("0x0000000D", 32)
+_NEG13 = from_hex_string("0xFFFFFFF3", 32)
+
+_VECTORS = {hex_str: from_hex_string(hex_str, 32)
+            for case in _OVERFLOW_CASES for hex_str in case[1:4]}
 
 class TestALU(unittest.TestCase):
     
-    def setUp(self):
-        self.alu = ALU(32)
-    
-    def test_add_overflow_cases(self):
-        test_cases = [
-            ("0x7FFFFFFF", "0x00000001", "0x80000000", 
-             {'N': 1, 'Z': 0, 'C': 0, 'V': 1}, "INT_MAX + 1"),
-            ("0xFFFFFFFF", "0xFFFFFFFF", "0xFFFFFFFE", 
-             {'N': 1, 'Z': 0, 'C': 1, 'V': 0}, "-1 + -1"),
-            ("0x0000000D", "0xFFFFFFF3", "0x00000000", 
-             {'N': 0, 'Z': 1, 'C': 1, 'V': 0}, "13 + -13"),
-        ]
-        
-        for a_hex, b_hex, expected_result_hex, expected_flags, description in test_cases:
-            with self.subTest(description=description):
-                a_bits = from_hex_string(a_hex, 32)
-                b_bits = from_hex_string(b_hex, 32)
-                
-                result = self.alu.add(a_bits, b_bits)
-                
-                result_hex = to_hex_string(result['result'])
-                
-                from bit_utils import bits_to_int
-                expected_decimal = bits_to_int(from_hex_string(expected_result_hex, 32))
-                actual_decimal = bits_to_int(result['result'])
-                self.assertEqual(actual_decimal, expected_decimal,
-                               f"Decimal result mismatch for {description}")
-                
-                self.assertEqual(result_hex, expected_result_hex,
-                               f"Hex pattern mismatch for {description}")
-                
-                for flag_name, expected_value in expected_flags.items():
-                    self.assertEqual(result[flag_name], expected_value,
-                                   f"Flag {flag_name} mismatch for {description}")
+    @classmethod
+    def setUpClass(cls):
+        cls.alu = ALU(32)
     
-    def test_sub_overflow_cases(self):
-        test_cases = [
-            ("0x80000000", "0x00000001", "0x7FFFFFFF", 
-             {'N': 0, 'Z': 0, 'C': 1, 'V': 1}, "INT_MIN - 1"),
-            ("0x0000000D", "0x00000007", "0x00000006", 
-             {'N': 0, 'Z': 0, 'C': 1, 'V': 0}, "13 - 7"),
-            ("0x00000000", "0x00000001", "0xFFFFFFFF", 
-             {'N': 1, 'Z': 0, 'C': 0, 'V': 0}, "0 - 1"),
-        ]
+    def test_overflow_cases(self):
+        operations = {'ADD': self.alu.add, 'SUB': self.alu.sub}
         
-        for a_hex, b_hex, expected_result_hex, expected_flags, description in test_cases:
+        for op, a_hex, b_hex, expected_result_hex, expected_flags, description in _OVERFLOW_CASES:
             with self.subTest(description=description):
-                a_bits = from_hex_string(a_hex, 32)
-                b_bits = from_hex_string(b_hex, 32)
+                a_bits = _VECTORS[a_hex]
+                b_bits = _VECTORS[b_hex]
                 
-                result = self.alu.sub(a_bits, b_bits)
+                result = operations[op](a_bits, b_bits)
                 
                 result_hex = to_hex_string(result['result'])
                 
-                from bit_utils import bits_to_int
-                expected_decimal = bits_to_int(from_hex_string(expected_result_hex, 32))
+                expected_decimal = bits_to_int(_VECTORS[expected_result_hex])
                 actual_decimal = bits_to_int(result['result'])
                 self.assertEqual(actual_decimal, expected_decimal,
                                f"Decimal result mismatch for {description}")
@@ -81,36 +67,28 @@ class TestALU(unittest.TestCase):
                                    f"Flag {flag_name} mismatch for {description}")
     
     def test_flag_meanings(self):
-        result = self.alu.add(from_hex_string("0x00000001", 32), 
-                            from_hex_string("0x00000000", 32))
+        result = self.alu.add(_ONE, _ZERO)
         self.assertEqual(result['N'], 0, "N flag should be 0 for positive result")
         
-        result = self.alu.add(from_hex_string("0xFFFFFFFF", 32), 
-                            from_hex_string("0xFFFFFFFF", 32))
+        result = self.alu.add(_MINUS1, _MINUS1)
         self.assertEqual(result['N'], 1, "N flag should be 1 for negative result")
         
-        result = self.alu.add(from_hex_string("0x0000000D", 32), 
-                            from_hex_string("0xFFFFFFF3", 32))
+        result = self.alu.add(_POS13, _NEG13)
         self.assertEqual(result['Z'], 1, "Z flag should be 1 for zero result")
         
-        result = self.alu.add(from_hex_string("0x00000001", 32), 
-                            from_hex_string("0x00000001", 32))
+        result = self.alu.add(_ONE, _ONE)
         self.assertEqual(result['Z'], 0, "Z flag should be 0 for non-zero result")
         
-        result = self.alu.add(from_hex_string("0xFFFFFFFF", 32), 
-                            from_hex_string("0x00000001", 32))
+        result = self.alu.add(_MINUS1, _ONE)
         self.assertEqual(result['C'], 1, "C flag should be 1 when carry out occurs")
         
-        result = self.alu.add(from_hex_string("0x00000001", 32), 
-                            from_hex_string("0x00000001", 32))
+        result = self.alu.add(_ONE, _ONE)
         self.assertEqual(result['C'], 0, "C flag should be 0 when no carry out")
         
-        result = self.alu.add(from_hex_string("0x7FFFFFFF", 32), 
-                            from_hex_string("0x00000001", 32))
+        result = self.alu.add(_INTMAX, _ONE)
         self.assertEqual(result['V'], 1, "V flag should be 1 for signed overflow")
         
-        result = self.alu.add(from_hex_string("0x00000001", 32), 
-                            from_hex_string("0x00000001", 32))
+        result = self.alu.add(_ONE, _ONE)
         self.assertEqual(result['V'], 0, "V flag should be 0 when no overflow")
     
     def test_execute_method(self):
@@ -129,7 +107,27 @@ class TestALU(unittest.TestCase):
         
         with self.assertRaises(ValueError):
             self.alu.execute(a_bits, b_bits, "INVALID")
-    
+
+    def test_execute_int_matches_execute(self):
+        test_cases = [
+            (0x0000000D, 0x00000007),
+            (0x7FFFFFFF, 0x00000001),
+            (0x00000000, 0x00000001),
+            (0xFFFFFFFF, 0xFFFFFFFF),
+        ]
+
+        for a, b in test_cases:
+            for op in ("ADD", "SUB", "AND", "OR", "XOR"):
+                with self.subTest(a=a, b=b, op=op):
+                    a_bits = from_hex_string(f"0x{a:08X}", 32)
+                    b_bits = from_hex_string(f"0x{b:08X}", 32)
+                    expected = self.alu.execute(a_bits, b_bits, op)['result']
+                    actual = self.alu.execute_int(a, b, op)
+                    self.assertEqual(to_hex_string(expected), f"0x{actual:08X}")
+
+        with self.assertRaises(ValueError):
+            self.alu.execute_int(1, 2, "INVALID")
+
     def test_edge_case_values(self):
         edge_cases = [
             (0, 0, "ADD", 0, "Zero + Zero"),
@@ -154,5 +152,36 @@ class TestALU(unittest.TestCase):
                 self.assertEqual(actual_result, expected_result,
                                f"Edge case failed: {description}")
 
+    def test_adder_model_matches_alu(self):
+        adder = RippleCarryAdder(32)
+
+        test_cases = [
+            ("0x7FFFFFFF", "0x00000001"),
+            ("0xFFFFFFFF", "0xFFFFFFFF"),
+            ("0x0000000D", "0xFFFFFFF3"),
+            ("0x12345678", "0x9ABCDEF0"),
+            ("0x00000000", "0x00000001"),
+            ("0x0000000D", "0x00000000"),
+        ]
+
+        for a_hex, b_hex in test_cases:
+            with self.subTest(a=a_hex, b=b_hex):
+                a_bits = from_hex_string(a_hex, 32)
+                b_bits = from_hex_string(b_hex, 32)
+
+                expected = self.alu.add(a_bits, b_bits)
+                sum_bits, carry_out = adder.add(a_bits, b_bits, 0)
+                self.assertEqual(sum_bits, expected['result'], "Adder sum mismatch")
+                self.assertEqual(carry_out, expected['C'], "Adder carry mismatch")
+
+                expected = self.alu.sub(a_bits, b_bits)
+                diff_bits, carry_out = adder.subtract(a_bits, b_bits)
+                self.assertEqual(diff_bits, expected['result'], "Adder difference mismatch")
+                self.assertEqual(carry_out, expected['C'], "Adder borrow mismatch")
+
+                sum_bits, carry_out = adder.add(a_bits, b_bits, 1)
+                self.assertEqual(bits_to_uint(sum_bits) + (carry_out << 32),
+                               bits_to_uint(a_bits) + bits_to_uint(b_bits) + 1, "Carry-in not applied")
+
 if __name__ == '__main__':
     unittest.main()
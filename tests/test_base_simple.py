@@ -4,8 +4,10 @@ Test for the base program
 
 import sys
 import os
+import traceback
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(_ROOT)
 
 from cpu import CPU
 from hex_loader import load_hex_file
@@ -16,7 +18,7 @@ def test_base():
     print("=" * 60)
     
     try:
-        prog_hex_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'prog.hex')
+        prog_hex_path = os.path.join(_ROOT, 'prog.hex')
         
         instructions = load_hex_file(prog_hex_path)
         print(f"Loaded {len(instructions)} instructions")
@@ -73,7 +75,6 @@ def test_base():
         
     except Exception as e:
         print(f"Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
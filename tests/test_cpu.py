@@ -4,21 +4,87 @@ Test all instructions and corner cases for RISC-V CPU
 
 import sys
 import os
+import traceback
+from functools import lru_cache
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(_ROOT)
 
 from cpu import CPU
-from hex_loader import load_hex_file
-from bit_utils import bits_to_int, to_hex_string, int_to_bits, from_hex_string
+from hex_loader import load_hex_words
+from bit_utils import uint_to_int
 from instruction_decoder import InstructionDecoder
 
+@lru_cache(maxsize=16)
+def _load_program_words(path: str, mtime: float) -> tuple:
+    return tuple(load_hex_words(path))
+
+_PROGRAMS = {
+    'arithmetic': (
+        0x00A00093,
+        0x00500113,
+        0x002081B3,
+        0x40210233,
+        0x01408293,
+        0x0000006F,
+    ),
+    'logical': (
+        0x00F00093,
+        0x00300113,
+        0x0020F1B3,
+        0x0020E233,
+        0x0020C2B3,
+        0x0000006F,
+    ),
+    'shift': (
+        0x00800093,
+        0x00209113,
+        0x0010D193,
+        0xFF800213,
+        0x40225293,
+        0x0000006F,
+    ),
+    'branch': (
+        0x00500093,
+        0x00500113,
+        0x00A00193,
+        0x00208463,
+        0x00100213,
+        0x00200213,
+        0x00318463,
+        0x00100293,
+        0x00200293,
+        0x0000006F,
+    ),
+    'jump': (
+        0x10000093,
+        0x0080016F,
+        0x00100193,
+        0x00200193,
+        0x000080E7,
+        0x0000006F,
+    ),
+    'memory': (
+        0x000100B7,
+        0x02A00113,
+        0x0020A023,
+        0x0000A183,
+        0x0000006F,
+    ),
+    'max_min': (
+        0xFFF00093,
+        0x80000237,
+        0x0000006F,
+    ),
+}
+
 class CPUTestSuite:
     def __init__(self):
         self.passed = 0
         self.failed = 0
         self.tests = []
         self.decoder = InstructionDecoder()
-        self.prog_hex_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'prog.hex')
+        self.prog_hex_path = os.path.join(_ROOT, 'prog.hex')
     
     def run_test(self, test_name: str, test_func):
         print(f"\n{'='*60}")
@@ -35,277 +101,185 @@ class CPUTestSuite:
                 self.failed += 1
         except Exception as e:
             print(f"ERROR in {test_name}: {e}")
-            import traceback
             traceback.print_exc()
             self.failed += 1
         
         self.tests.append((test_name, result if 'result' in locals() else False))
     
     def test_base_program(self):
-        instructions = load_hex_file(self.prog_hex_path)
+        instructions = _load_program_words(self.prog_hex_path, os.path.getmtime(self.prog_hex_path))
         cpu = CPU()
         cpu.load_program(instructions)
         stats = cpu.run(max_cycles=1000)
         
-        state = cpu.get_state()
-        regs = state['registers']
-        
         expected = {
-            'x1': 5,
-            'x2': 10,
-            'x3': 15,
-            'x4': 15,
-            'x5': 0x00010000,
-            'x6': 2
+            1: 5,
+            2: 10,
+            3: 15,
+            4: 15,
+            5: 0x00010000,
+            6: 2
         }
         
         all_passed = True
-        for reg_name, expected_val in expected.items():
-            actual_val = bits_to_int(regs[reg_name])
+        for reg, expected_val in expected.items():
+            actual_val = uint_to_int(cpu.reg(reg))
             if actual_val != expected_val:
-                print(f"  {reg_name}: Expected {expected_val}, Got {actual_val}")
+                print(f"  x{reg}: Expected {expected_val}, Got {actual_val}")
                 all_passed = False
         
-        mem = state['data_memory']
-        if '0x00010000' in mem:
-            mem_val = int(mem['0x00010000'], 16)
-            if mem_val != 15:
-                print(f"  Memory[0x00010000]: Expected 15 but got {mem_val}")
-                all_passed = False
-        else:
+        mem_val = cpu.mem_word(0x00010000)
+        if not cpu.dmem.is_written(0x00010000):
             print(f"  Memory[0x00010000]: Expected 15 but got (empty)")
             all_passed = False
+        elif mem_val != 15:
+            print(f"  Memory[0x00010000]: Expected 15 but got {mem_val}")
+            all_passed = False
         
         return all_passed
     
     def test_arithmetic_operations(self):
-        instructions = [
-            from_hex_string('0x00A00093', 32),
-            from_hex_string('0x00500113', 32),
-            from_hex_string('0x002081B3', 32),
-            from_hex_string('0x40210233', 32),
-            from_hex_string('0x01408293', 32),
-            from_hex_string('0x0000006F', 32),
-        ]
-        
         cpu = CPU()
-        cpu.load_program(instructions)
+        cpu.load_program(_PROGRAMS['arithmetic'])
         cpu.run(max_cycles=100)
         
-        state = cpu.get_state()
-        regs = state['registers']
-        
         expected = {
-            'x1': 10,
-            'x2': 5,
-            'x3': 15,
-            'x4': -5,
-            'x5': 30
+            1: 10,
+            2: 5,
+            3: 15,
+            4: -5,
+            5: 30
         }
         
         all_passed = True
-        for reg_name, expected_val in expected.items():
-            actual_val = bits_to_int(regs[reg_name])
+        for reg, expected_val in expected.items():
+            actual_val = uint_to_int(cpu.reg(reg))
             if actual_val != expected_val:
-                print(f"  {reg_name}: Expected {expected_val} but got {actual_val}")
+                print(f"  x{reg}: Expected {expected_val} but got {actual_val}")
                 all_passed = False
         
         return all_passed
     
     def test_logical_operations(self):
-        instructions = [
-            from_hex_string('0x00F00093', 32),
-            from_hex_string('0x00300113', 32),
-            from_hex_string('0x0020F1B3', 32),
-            from_hex_string('0x0020E233', 32),
-            from_hex_string('0x0020C2B3', 32),
-            from_hex_string('0x0000006F', 32),
-        ]
-        
         cpu = CPU()
-        cpu.load_program(instructions)
+        cpu.load_program(_PROGRAMS['logical'])
         cpu.run(max_cycles=100)
         
-        state = cpu.get_state()
-        regs = state['registers']
-        
         expected = {
-            'x1': 15,
-            'x2': 3,
-            'x3': 3,
-            'x4': 15,
-            'x5': 12
+            1: 15,
+            2: 3,
+            3: 3,
+            4: 15,
+            5: 12
         }
         
         all_passed = True
-        for reg_name, expected_val in expected.items():
-            actual_val = bits_to_int(regs[reg_name])
+        for reg, expected_val in expected.items():
+            actual_val = uint_to_int(cpu.reg(reg))
             if actual_val != expected_val:
-                print(f"  {reg_name}: Expected {expected_val} but got {actual_val}")
+                print(f"  x{reg}: Expected {expected_val} but got {actual_val}")
                 all_passed = False
         
         return all_passed
     
     def test_shift_operations(self):
-        instructions = [
-            from_hex_string('0x00800093', 32),
-            from_hex_string('0x00209113', 32),
-            from_hex_string('0x0010D193', 32),
-            from_hex_string('0xFF800213', 32),
-            from_hex_string('0x40225293', 32),
-            from_hex_string('0x0000006F', 32),
-        ]
-        
         cpu = CPU()
-        cpu.load_program(instructions)
+        cpu.load_program(_PROGRAMS['shift'])
         cpu.run(max_cycles=100)
         
-        state = cpu.get_state()
-        regs = state['registers']
-        
         expected = {
-            'x1': 8,
-            'x2': 32,
-            'x3': 4,
-            'x4': -8,
-            'x5': -2
+            1: 8,
+            2: 32,
+            3: 4,
+            4: -8,
+            5: -2
         }
         
         all_passed = True
-        for reg_name, expected_val in expected.items():
-            actual_val = bits_to_int(regs[reg_name])
+        for reg, expected_val in expected.items():
+            actual_val = uint_to_int(cpu.reg(reg))
             if actual_val != expected_val:
-                print(f"  {reg_name}: Expected {expected_val} but got {actual_val}")
+                print(f"  x{reg}: Expected {expected_val} but got {actual_val}")
                 all_passed = False
         
         return all_passed
     
     def test_branch_operations(self):
-        instructions = [
-            from_hex_string('0x00500093', 32),
-            from_hex_string('0x00500113', 32),
-            from_hex_string('0x00A00193', 32),
-            from_hex_string('0x00208463', 32),
-            from_hex_string('0x00100213', 32),
-            from_hex_string('0x00200213', 32),
-            from_hex_string('0x00318463', 32),
-            from_hex_string('0x00100293', 32),
-            from_hex_string('0x00200293', 32),
-            from_hex_string('0x0000006F', 32),
-        ]
-        
         cpu = CPU()
-        cpu.load_program(instructions)
+        cpu.load_program(_PROGRAMS['branch'])
         cpu.run(max_cycles=100)
         
-        state = cpu.get_state()
-        regs = state['registers']
-        
         expected = {
-            'x1': 5,
-            'x2': 5,
-            'x3': 10,
-            'x4': 2,
-            'x5': 2
+            1: 5,
+            2: 5,
+            3: 10,
+            4: 2,
+            5: 2
         }
         
         all_passed = True
-        for reg_name, expected_val in expected.items():
-            actual_val = bits_to_int(regs[reg_name])
+        for reg, expected_val in expected.items():
+            actual_val = uint_to_int(cpu.reg(reg))
             if actual_val != expected_val:
-                print(f"  {reg_name}: Expected {expected_val} but got {actual_val}")
+                print(f"  x{reg}: Expected {expected_val} but got {actual_val}")
                 all_passed = False
         
         return all_passed
     
     def test_jump_operations(self):
-        instructions = [
-            from_hex_string('0x10000093', 32),
-            from_hex_string('0x0080016F', 32),
-            from_hex_string('0x00100193', 32),
-            from_hex_string('0x00200193', 32),
-            from_hex_string('0x000080E7', 32),
-            from_hex_string('0x0000006F', 32),
-        ]
-        
         cpu = CPU()
-        cpu.load_program(instructions)
+        cpu.load_program(_PROGRAMS['jump'])
         cpu.run(max_cycles=100)
         
-        state = cpu.get_state()
-        regs = state['registers']
-        
         all_passed = True
-        if bits_to_int(regs['x1']) != 0x100:
-            print(f"  x1: Expected 0x100 but got {hex(bits_to_int(regs['x1']))}")
+        if uint_to_int(cpu.reg(1)) != 0x100:
+            print(f"  x1: Expected 0x100 but got {hex(uint_to_int(cpu.reg(1)))}")
             all_passed = False
         
-        if bits_to_int(regs['x3']) != 2:
-            print(f"  x3: Expected 2 but got {bits_to_int(regs['x3'])}")
+        if uint_to_int(cpu.reg(3)) != 2:
+            print(f"  x3: Expected 2 but got {uint_to_int(cpu.reg(3))}")
             all_passed = False
         
         return all_passed
     
     def test_memory_operations(self):
-        instructions = [
-            from_hex_string('0x000100B7', 32),
-            from_hex_string('0x02A00113', 32),
-            from_hex_string('0x0020A023', 32),
-            from_hex_string('0x0000A183', 32),
-            from_hex_string('0x0000006F', 32),
-        ]
-        
         cpu = CPU()
-        cpu.load_program(instructions)
+        cpu.load_program(_PROGRAMS['memory'])
         cpu.run(max_cycles=100)
         
-        state = cpu.get_state()
-        regs = state['registers']
-        mem = state['data_memory']
-        
         all_passed = True
         
-        if bits_to_int(regs['x1']) != 0x00010000:
-            print(f"  x1: Expected 0x00010000 but got {hex(bits_to_int(regs['x1']))}")
+        if uint_to_int(cpu.reg(1)) != 0x00010000:
+            print(f"  x1: Expected 0x00010000 but got {hex(uint_to_int(cpu.reg(1)))}")
             all_passed = False
         
-        if bits_to_int(regs['x2']) != 42:
-            print(f"  x2: Expected 42 but got {bits_to_int(regs['x2'])}")
+        if uint_to_int(cpu.reg(2)) != 42:
+            print(f"  x2: Expected 42 but got {uint_to_int(cpu.reg(2))}")
             all_passed = False
         
-        if bits_to_int(regs['x3']) != 42:
-            print(f"  x3: Expected 42 but got {bits_to_int(regs['x3'])}")
+        if uint_to_int(cpu.reg(3)) != 42:
+            print(f"  x3: Expected 42 but got {uint_to_int(cpu.reg(3))}")
             all_passed = False
         
-        if '0x00010000' not in mem:
+        mem_val = cpu.mem_word(0x00010000)
+        if not cpu.dmem.is_written(0x00010000):
             print(f"  Memory[0x00010000]: Expected 42 but got (empty)")
             all_passed = False
-        else:
-            mem_val = int(mem['0x00010000'], 16)
-            if mem_val != 42:
-                print(f"  Memory[0x00010000]: Expected 42 but got {mem_val}")
-                all_passed = False
+        elif mem_val != 42:
+            print(f"  Memory[0x00010000]: Expected 42 but got {mem_val}")
+            all_passed = False
         
         return all_passed
     
     def test_max_min_values(self):
-        instructions = [
-            from_hex_string('0xFFF00093', 32),
-            from_hex_string('0x80000237', 32),
-            from_hex_string('0x0000006F', 32),
-        ]
-        
         cpu = CPU()
-        cpu.load_program(instructions)
+        cpu.load_program(_PROGRAMS['max_min'])
         cpu.run(max_cycles=100)
         
-        state = cpu.get_state()
-        regs = state['registers']
-        
         all_passed = True
         
-        if bits_to_int(regs['x1']) != -1:
-            print(f"  x1: Expected -1 but got {bits_to_int(regs['x1'])}")
+        if uint_to_int(cpu.reg(1)) != -1:
+            print(f"  x1: Expected -1 but got {uint_to_int(cpu.reg(1))}")
             all_passed = False
         
         return all_passed
@@ -6,15 +6,27 @@ import unittest
 import sys
 import os
 import struct
+from array import array
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from fpu_f32 import Float32
 from bit_utils import to_hex_string
 
+def _bv(*runs) -> array:
+    bits = array('B')
+    for value, count in runs:
+        bits.extend([value] * count)
+    return bits
+
+_INF_BITS = _bv((0, 1), (1, 8), (0, 23))
+_NEG_INF_BITS = _bv((1, 1), (1, 8), (0, 23))
+_NAN_BITS = _bv((0, 1), (1, 8), (1, 1), (0, 22))
+
 class TestFloat32(unittest.TestCase):
-    def setUp(self):
-        self.fpu = Float32()
+    @classmethod
+    def setUpClass(cls):
+        cls.fpu = Float32()
     
     def test_pack_unpack_known_values(self):
         test_cases = [
@@ -60,10 +72,7 @@ class TestFloat32(unittest.TestCase):
                               msg="0.1 + 0.2 decimal value mismatch")
     
     def test_overflow_cases(self):
-        inf_bits = [0] + [1] * 8 + [0] * 23
-        neg_inf_bits = [1] + [1] * 8 + [0] * 23
-        
-        result = self.fpu.fmul_f32(inf_bits, inf_bits)
+        result = self.fpu.fmul_f32(_INF_BITS, _INF_BITS)
         result_hex = to_hex_string(result['result'])
         
         self.assertIn(result_hex, ["0x7F800000", "0x7FC00000"],
@@ -75,7 +84,26 @@ class TestFloat32(unittest.TestCase):
         elif result_hex == "0x7FC00000":
             self.assertEqual(result['flags']['invalid'], 1,
                            "Invalid flag should be set for NaN result")
+        
+        result = self.fpu.fmul_f32(_NEG_INF_BITS, _INF_BITS)
+        self.assertEqual(to_hex_string(result['result']), "0xFF800000",
+                        "-infinity * infinity should result in -infinity")
     
+    def test_finite_overflow_rounds_to_infinity(self):
+        large_bits = self.fpu.pack_f32(3.0e38)['bits']
+        ten_bits = self.fpu.pack_f32(10.0)['bits']
+
+        result = self.fpu.fmul_f32(large_bits, ten_bits)
+        self.assertEqual(to_hex_string(result['result']), "0x7F800000",
+                        "Finite overflow should round to +infinity")
+        self.assertEqual(result['flags']['overflow'], 1,
+                        "Overflow flag should be set for finite overflow")
+
+        neg_large_bits = self.fpu.pack_f32(-3.0e38)['bits']
+        result = self.fpu.fmul_f32(neg_large_bits, ten_bits)
+        self.assertEqual(to_hex_string(result['result']), "0xFF800000",
+                        "Negative finite overflow should round to -infinity")
+
     def test_underflow_cases(self):
         small_value = 1e-45
         packed = self.fpu.pack_f32(small_value)
@@ -86,10 +114,8 @@ class TestFloat32(unittest.TestCase):
                        "Underflow should result in a small number")
     
     def test_nan_infinity_propagation(self):
-        nan_bits = [0] + [1] * 8 + [1] + [0] * 22
-        
         normal_bits = self.fpu.pack_f32(1.0)['bits']
-        result = self.fpu.fadd_f32(nan_bits, normal_bits)
+        result = self.fpu.fadd_f32(_NAN_BITS, normal_bits)
         
         result_hex = to_hex_string(result['result'])
         self.assertEqual(result_hex, "0x7FC00000",
@@ -97,8 +123,7 @@ class TestFloat32(unittest.TestCase):
         self.assertEqual(result['flags']['invalid'], 1,
                         "Invalid flag should be set for NaN")
         
-        inf_bits = [0] + [1] * 8 + [0] * 23
-        result = self.fpu.fadd_f32(inf_bits, inf_bits)
+        result = self.fpu.fadd_f32(_INF_BITS, _INF_BITS)
         
         result_hex = to_hex_string(result['result'])
         self.assertIn(result_hex, ["0x7FC00000", "0x7F800000"],
@@ -128,6 +153,20 @@ class TestFloat32(unittest.TestCase):
         self.assertEqual(neg_unpacked['value'], -0.0,
                         "Negative zero unpack should be -0.0")
     
+    def test_repeated_pack_results_are_independent(self):
+        first = self.fpu.pack_f32(3.4e38)
+        first['bits'][0] = 1
+        first['flags']['overflow'] = 1
+        
+        second = self.fpu.pack_f32(3.4e38)
+        self.assertEqual(second['bits'][0], 0, "Cached pack should return fresh bits")
+        self.assertEqual(second['flags']['overflow'], 0, "Cached pack should return fresh flags")
+        
+        self.assertEqual(self.fpu.pack_f32(0.0)['hex'], "0x00000000")
+        self.assertEqual(self.fpu.pack_f32(-0.0)['hex'], "0x80000000")
+        self.assertEqual(self.fpu.pack_f32(float('nan'))['hex'], "0x7FC00000")
+        self.assertEqual(self.fpu.pack_f32(-float('nan'))['hex'], "0x7FC00000")
+    
     def test_arithmetic_operations(self):
         a = self.fpu.pack_f32(1.5)
         b = self.fpu.pack_f32(2.25)
@@ -178,23 +217,23 @@ class TestFloat32(unittest.TestCase):
         small_value = 1e-45
         packed_small = self.fpu.pack_f32(small_value)
         
-        nan_bits = [0] + [1] * 8 + [1] + [0] * 22
         normal_bits = self.fpu.pack_f32(1.0)['bits']
-        result = self.fpu.fadd_f32(nan_bits, normal_bits)
+        result = self.fpu.fadd_f32(_NAN_BITS, normal_bits)
         
         self.assertEqual(result['flags']['invalid'], 1,
                         "NaN operation")
     
     def test_ieee754_compliance(self):
         test_values = [1.0, -1.0, 0.5, -0.5, 3.14159, -3.14159]
+        count = len(test_values)
+        struct_words = struct.unpack(f'>{count}I', struct.pack(f'>{count}f', *test_values))
         
-        for value in test_values:
+        for value, struct_word in zip(test_values, struct_words):
             with self.subTest(value=value):
                 our_packed = self.fpu.pack_f32(value)
                 our_hex = our_packed['hex']
                 
-                struct_packed = struct.pack('>f', value)
-                struct_hex = '0x' + struct_packed.hex().upper()
+                struct_hex = f"0x{struct_word:08X}"
                 
                 self.assertEqual(our_hex, struct_hex,
                                f"IEEE-754 compliance failed for {value}")
@@ -212,6 +251,50 @@ class TestFloat32(unittest.TestCase):
                 packed = self.fpu.pack_f32(value)
                 self.assertEqual(packed['hex'], expected_hex,
                                f"Precision failed for {value}")
+    
+    def test_value_ops_match_bit_ops(self):
+        values = [1.5, 2.25, -0.0, 0.1, 3.0e38, 1e-45, -7.0, float('inf')]
+        
+        for a in values:
+            for b in values:
+                with self.subTest(a=a, b=b):
+                    a_bits = self.fpu.to_bits(a)
+                    b_bits = self.fpu.to_bits(b)
+                    
+                    chained_bits = self.fpu.fmul_f32(
+                        self.fpu.fadd_f32(a_bits, b_bits)['result'],
+                        self.fpu.fsub_f32(a_bits, b_bits)['result'])['result']
+                    
+                    a_value = self.fpu.from_bits(a_bits)
+                    b_value = self.fpu.from_bits(b_bits)
+                    chained_value = self.fpu.fmul_val(self.fpu.fadd_val(a_value, b_value),
+                                                      self.fpu.fsub_val(a_value, b_value))
+                    
+                    self.assertEqual(self.fpu.to_bits(chained_value), chained_bits)
+    
+    def test_batch_matches_scalar(self):
+        values = [1.5, 2.25, -0.0, 0.1, 3.0e38, 1e-45, float('inf'), float('nan')]
+        words = [int(self.fpu.pack_f32(value)['hex'], 16) for value in values]
+        a_words = words
+        b_words = words[::-1]
+        
+        for name in ('fadd_f32', 'fsub_f32', 'fmul_f32'):
+            with self.subTest(operation=name):
+                batch = getattr(self.fpu, name + '_batch')(a_words, b_words)
+                
+                expected_flags = {'overflow': 0, 'underflow': 0, 'invalid': 0, 'inexact': 0}
+                for a, b, actual in zip(a_words, b_words, batch['result']):
+                    scalar = getattr(self.fpu, name)(
+                        [(a >> i) & 1 for i in range(31, -1, -1)],
+                        [(b >> i) & 1 for i in range(31, -1, -1)])
+                    self.assertEqual(f"0x{actual:08X}", to_hex_string(scalar['result']))
+                    for flag, value in scalar['flags'].items():
+                        expected_flags[flag] |= value
+                
+                self.assertEqual(batch['flags'], expected_flags)
+        
+        with self.assertRaises(ValueError):
+            self.fpu.fadd_f32_batch(a_words, b_words[:-1])
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,56 @@
+"""
+Unit tests for the hex program loader
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from array import array
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hex_loader import load_hex_file, load_hex_words, save_hex_file, as_bitlists
+from bit_utils import from_hex_string, WORD_TYPECODE
+
+class TestHexLoader(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.hex')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_load_words_and_bitlists(self):
+        with open(self.path, 'w') as f:
+            f.write("00500093  # addi x1, x0, 5\n\n0x00418463\nFFFFFFFF\n")
+
+        words = load_hex_words(self.path)
+        self.assertIsInstance(words, array)
+        self.assertEqual(words.typecode, WORD_TYPECODE)
+        self.assertEqual(words.itemsize, 4)
+        self.assertEqual(list(words), [0x00500093, 0x00418463, 0xFFFFFFFF])
+
+        self.assertEqual(load_hex_file(self.path), list(as_bitlists(words)))
+        self.assertEqual(load_hex_file(self.path)[1], from_hex_string("0x00418463", 32))
+
+    def test_save_round_trip(self):
+        words = array(WORD_TYPECODE, [0x00500093, 0x0000000F, 0x80000000])
+
+        save_hex_file(self.path, words)
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "00500093\n0000000F\n80000000\n")
+
+        save_hex_file(self.path, list(as_bitlists(words)))
+        self.assertEqual(load_hex_words(self.path), words)
+
+    def test_invalid_lines(self):
+        with open(self.path, 'w') as f:
+            f.write("0050009G\n")
+
+        with self.assertRaises(ValueError):
+            load_hex_words(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
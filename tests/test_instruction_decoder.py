@@ -0,0 +1,93 @@
+"""
+Unit tests for the RV32I instruction decoder
+"""
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instruction_decoder import InstructionDecoder
+from bit_utils import from_hex_string
+
+class TestInstructionDecoder(unittest.TestCase):
+
+    def setUp(self):
+        self.decoder = InstructionDecoder()
+
+    def test_register_fields(self):
+        decoded = self.decoder.decode_u32(0x40110233)  # sub x4, x2, x1
+
+        self.assertEqual(decoded['opcode_int'], 0x33)
+        self.assertEqual(decoded['rd'], 4)
+        self.assertEqual(decoded['rs1'], 2)
+        self.assertEqual(decoded['rs2'], 1)
+        self.assertEqual(decoded['funct3'], 0x0)
+        self.assertEqual(decoded['funct7'], 0x20)
+        self.assertEqual(self.decoder.get_instruction_name(decoded), 'SUB')
+
+        decoded = self.decoder.decode_u32(0x01FF8F33)  # add x30, x31, x31
+        self.assertEqual(decoded['rd'], 30)
+        self.assertEqual(decoded['rs1'], 31)
+        self.assertEqual(decoded['rs2'], 31)
+
+    def test_immediates(self):
+        test_cases = [
+            (0xFF800213, 'imm_i', -8, "addi x4, x0, -8"),
+            (0x0020A023, 'imm_s', 0, "sw x2, 0(x1)"),
+            (0xFE20AE23, 'imm_s', -4, "sw x2, -4(x1)"),
+            (0x00418463, 'imm_b', 8, "beq x3, x4, 8"),
+            (0xFE208EE3, 'imm_b', -4, "beq x1, x2, -4"),
+            (0x80000237, 'imm_u', 0x80000000, "lui x4, 0x80000"),
+            (0x0080016F, 'imm_j', 8, "jal x2, 8"),
+            (0xFFDFF06F, 'imm_j', -4, "jal x0, -4"),
+        ]
+
+        for instruction, field, expected, description in test_cases:
+            with self.subTest(description=description):
+                decoded = self.decoder.decode_u32(instruction)
+                self.assertEqual(decoded[field], expected)
+
+    def test_shift_amount(self):
+        decoded = self.decoder.decode_u32(0x40225293)  # srai x5, x4, 2
+
+        self.assertEqual(decoded['shamt'], 2)
+        self.assertEqual(self.decoder.get_instruction_name(decoded), 'SRAI')
+
+    def test_instruction_types(self):
+        test_cases = [
+            (0x40110233, 'R'),
+            (0x00500093, 'I'),
+            (0x0020A023, 'S'),
+            (0x00418463, 'B'),
+            (0x80000237, 'U'),
+            (0x0080016F, 'J'),
+            (0x0000007F, 'UNKNOWN'),
+        ]
+
+        for instruction, expected in test_cases:
+            with self.subTest(instruction=hex(instruction)):
+                decoded = self.decoder.decode_u32(instruction)
+                self.assertEqual(self.decoder.get_instruction_type(decoded), expected)
+
+    def test_decode_cache(self):
+        first = self.decoder.decode_u32(0x00500093)
+        self.assertIs(self.decoder.decode_u32(0x00500093), first)
+        self.assertEqual(first, InstructionDecoder().decode_u32(0x00500093))
+
+        for word in range(0x13, 0x13 + (5000 << 7), 1 << 7):
+            self.decoder.decode_u32(word)
+        self.assertLessEqual(len(self.decoder._cache), 4096)
+
+    def test_decode_bits_matches_u32(self):
+        for hex_str in ("0x00500093", "0x00418463", "0x000080E7", "0xFFF00093"):
+            with self.subTest(instruction=hex_str):
+                self.assertEqual(self.decoder.decode(from_hex_string(hex_str, 32)),
+                               self.decoder.decode_u32(int(hex_str, 16)))
+
+        with self.assertRaises(ValueError):
+            self.decoder.decode([0] * 16)
+
+if __name__ == '__main__':
+    unittest.main()
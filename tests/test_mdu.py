@@ -13,10 +13,11 @@ from bit_utils import from_hex_string, to_hex_string, bits_to_int
 
 class TestMDU(unittest.TestCase):
 
-    def setUp(self):
-        self.mdu = MultiplyDivideUnit(32)
-        self.int_min = -(2 ** 31)
-        self.int_max = (2 ** 31) - 1
+    @classmethod
+    def setUpClass(cls):
+        cls.mdu = MultiplyDivideUnit(32)
+        cls.int_min = -(2 ** 31)
+        cls.int_max = (2 ** 31) - 1
     
     def test_mul_operations(self):
         test_cases = [
@@ -67,6 +68,65 @@ class TestMDU(unittest.TestCase):
                 self.assertEqual(actual_decimal, expected_decimal,
                                f"Decimal mismatch for {description}")
     
+    def test_multiply_known_products(self):
+        test_cases = [
+            (0x12345678, 0xFEDCBA87 - (1 << 32), 0xFF8CC948, 0xFFEB4990, 1),
+            (13, 7, 0x0000005B, 0x00000000, 0),
+            (-1, 2, 0xFFFFFFFE, 0xFFFFFFFF, 0),
+            (self.int_min, -1, 0x80000000, 0x00000000, 1),
+            (self.int_max, self.int_max, 0x00000001, 0x3FFFFFFF, 1),
+        ]
+        
+        for a_int, b_int, expected_low, expected_high, expected_overflow in test_cases:
+            with self.subTest(a=a_int, b=b_int):
+                self.assertEqual(self.mdu.multiplier.multiply_int(a_int, b_int),
+                               (expected_low, expected_high, expected_overflow))
+                
+                result = self.mdu.multiplier.multiply(from_hex_string(f"0x{a_int & 0xFFFFFFFF:08X}", 32),
+                                                      from_hex_string(f"0x{b_int & 0xFFFFFFFF:08X}", 32))
+                
+                self.assertEqual(to_hex_string(result['low']), f"0x{expected_low:08X}")
+                self.assertEqual(to_hex_string(result['high']), f"0x{expected_high:08X}")
+                self.assertEqual(result['overflow'], expected_overflow)
+    
+    def test_unsigned_high_multiplication(self):
+        rs1_bits = from_hex_string("0xFFFFFFFF", 32)
+        rs2_bits = from_hex_string("0xFFFFFFFF", 32)
+        
+        self.assertEqual(to_hex_string(self.mdu.mulhu(rs1_bits, rs2_bits)['rd']), "0xFFFFFFFE",
+                        "MULHU 0xFFFFFFFF * 0xFFFFFFFF high bits")
+        self.assertEqual(to_hex_string(self.mdu.mulhsu(rs1_bits, rs2_bits)['rd']), "0xFFFFFFFF",
+                        "MULHSU -1 * 0xFFFFFFFF high bits")
+        self.assertEqual(to_hex_string(self.mdu.mulh(rs1_bits, rs2_bits)['rd']), "0x00000000",
+                        "MULH -1 * -1 high bits")
+        
+        multiplier = self.mdu.multiplier
+        self.assertEqual(multiplier.multiply_words(0xFFFFFFFF, 0xFFFFFFFF, (False, False))[1], 0xFFFFFFFE)
+        self.assertEqual(multiplier.multiply_words(0xFFFFFFFF, 0xFFFFFFFF, (True, False))[1], 0xFFFFFFFF)
+        self.assertEqual(multiplier.multiply_words(0xFFFFFFFF, 0xFFFFFFFF)[:2], (0x00000001, 0x00000000))
+    
+    def test_batch_multiplication(self):
+        rs1_words = [0x12345678, 0x0000000D, 0xFFFFFFFF, 0x80000000]
+        rs2_words = [0xFEDCBA87, 0x00000007, 0xFFFFFFFF, 0xFFFFFFFF]
+        
+        operations = [
+            (self.mdu.mul, self.mdu.mul_batch),
+            (self.mdu.mulh, self.mdu.mulh_batch),
+            (self.mdu.mulhu, self.mdu.mulhu_batch),
+            (self.mdu.mulhsu, self.mdu.mulhsu_batch),
+        ]
+        
+        for scalar, batch in operations:
+            with self.subTest(operation=batch.__name__):
+                results = batch(rs1_words, rs2_words)
+                for rs1, rs2, actual in zip(rs1_words, rs2_words, results):
+                    expected = scalar(from_hex_string(f"0x{rs1:08X}", 32),
+                                      from_hex_string(f"0x{rs2:08X}", 32))
+                    self.assertEqual(f"0x{actual:08X}", to_hex_string(expected['rd']))
+        
+        with self.assertRaises(ValueError):
+            self.mdu.mul_batch(rs1_words, rs2_words[:-1])
+    
     def test_div_operations(self):
         test_cases = [
             ("0xFFFFFFF9", "0x00000003", "0xFFFFFFFE", "-7 / 3 = -2"),
@@ -136,6 +196,18 @@ class TestMDU(unittest.TestCase):
         self.assertEqual(result['overflow'], 1,
                         "INT_MIN / -1 should set overflow flag")
     
+    def test_divide_int_special_cases(self):
+        divider = self.mdu.divider
+        
+        self.assertEqual(divider.divide_int(-7, 3, signed=True), (0xFFFFFFFE, 0xFFFFFFFF, 0))
+        self.assertEqual(divider.divide_int(7, -3, signed=True), (0xFFFFFFFE, 0x00000001, 0))
+        self.assertEqual(divider.divide_int(-7, 0, signed=True), (0xFFFFFFFF, 0xFFFFFFF9, 0))
+        self.assertEqual(divider.divide_int(self.int_min, -1, signed=True), (0x80000000, 0, 1))
+        self.assertEqual(divider.divide_int(0xFFFFFFF9, 3, signed=True), (0xFFFFFFFE, 0xFFFFFFFF, 0))
+        self.assertEqual(divider.divide_int(0x80000000, 0xFFFFFFFF, signed=True), (0x80000000, 0, 1))
+        self.assertEqual(divider.divide_int(0x80000000, 3, signed=False), (0x2AAAAAAA, 0x00000002, 0))
+        self.assertEqual(divider.divide_int(0x80000000, 0, signed=False), (0xFFFFFFFF, 0x80000000, 0))
+    
     def test_rem_operations(self):
         test_cases = [
             ("0xFFFFFFF9", "0x00000003", "0xFFFFFFFF", "-7 % 3 = -1"),
@@ -163,7 +235,10 @@ class TestMDU(unittest.TestCase):
         rs1_bits = from_hex_string("0x0000000D", 32)
         rs2_bits = from_hex_string("0x00000007", 32)
         
-        result = self.mdu.mul(rs1_bits, rs2_bits)
+        self.assertEqual(self.mdu.mul(rs1_bits, rs2_bits)['trace'], [],
+                        "Trace should be empty unless requested")
+        
+        result = self.mdu.mul(rs1_bits, rs2_bits, trace=True)
         trace = result['trace']
         
         self.assertIsInstance(trace, list, "Trace should be a list")
@@ -177,7 +252,10 @@ class TestMDU(unittest.TestCase):
         dividend_bits = from_hex_string("0x0000000D", 32)
         divisor_bits = from_hex_string("0x00000003", 32)
         
-        result = self.mdu.div(dividend_bits, divisor_bits)
+        self.assertEqual(self.mdu.div(dividend_bits, divisor_bits)['trace'], [],
+                        "Trace should be empty unless requested")
+        
+        result = self.mdu.div(dividend_bits, divisor_bits, trace=True)
         trace = result['trace']
         
         self.assertIsInstance(trace, list, "Trace should be a list")
@@ -187,6 +265,38 @@ class TestMDU(unittest.TestCase):
             self.assertIn('step', step, "Trace step should have 'step' field")
             self.assertIn('action', step, "Trace step should have 'action' field")
     
+    def test_execute_dispatch(self):
+        rs1_words = [0x12345678, 0xFFFFFFF9, 0x80000000, 0x0000000D]
+        rs2_words = [0xFEDCBA87, 0x00000003, 0xFFFFFFFF, 0x00000000]
+        operations = {
+            'MUL': self.mdu.mul, 'MULH': self.mdu.mulh, 'MULHU': self.mdu.mulhu, 'MULHSU': self.mdu.mulhsu,
+            'DIV': self.mdu.div, 'DIVU': self.mdu.divu, 'REM': self.mdu.rem, 'REMU': self.mdu.remu,
+        }
+        
+        for op, method in operations.items():
+            for rs1, rs2 in zip(rs1_words, rs2_words):
+                with self.subTest(op=op, rs1=hex(rs1), rs2=hex(rs2)):
+                    rs1_bits = from_hex_string(f"0x{rs1:08X}", 32)
+                    rs2_bits = from_hex_string(f"0x{rs2:08X}", 32)
+                    expected = method(rs1_bits, rs2_bits)
+                    
+                    self.assertEqual(self.mdu.execute(rs1_bits, rs2_bits, op), expected)
+                    self.assertEqual(f"0x{self.mdu.execute_int(rs1, rs2, op):08X}",
+                                   to_hex_string(expected['rd']))
+        
+        with self.assertRaises(ValueError):
+            self.mdu.execute_int(1, 2, 'INVALID')
+    
+    def test_unit_wide_tracing(self):
+        mdu = MultiplyDivideUnit(32, trace=True)
+        rs1_bits = from_hex_string("0x0000000D", 32)
+        rs2_bits = from_hex_string("0x00000003", 32)
+        
+        for operation in (mdu.mul, mdu.mulh, mdu.mulhu, mdu.mulhsu, mdu.div, mdu.divu, mdu.rem, mdu.remu):
+            with self.subTest(operation=operation.__name__):
+                self.assertGreater(len(operation(rs1_bits, rs2_bits)['trace']), 0,
+                                 "Unit-wide tracing should produce a trace")
+    
     def test_edge_case_values(self):
         edge_cases = [
             (1, 1, 1, 1, "1 * 1, 1 / 1"),
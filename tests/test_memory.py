@@ -0,0 +1,67 @@
+"""
+Unit tests for the instruction and data memories
+"""
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory import DataMemory
+
+class TestDataMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.dmem = DataMemory(64, 0x00010000)
+
+    def test_dump_includes_stored_zero(self):
+        self.assertEqual(self.dmem.dump_memory(), {})
+
+        self.dmem.write_word_int(0x00010004, 0)
+        self.dmem.write_byte(0x00010009, [1] * 8)
+
+        self.assertEqual(self.dmem.dump_memory(), {
+            '0x00010004': '0x00000000',
+            '0x00010008': '0x0000FF00',
+        })
+        self.assertEqual(self.dmem.dump_memory(0x00010008, 0x0001000C), {'0x00010008': '0x0000FF00'})
+
+    def test_dump_includes_word_starting_in_range(self):
+        self.dmem.write_word_int(0x00010000, 0xCAFEF00D)
+        self.dmem.write_word_int(0x00010004, 0x00000001)
+
+        self.assertEqual(self.dmem.dump_memory(0x00010000, 0x00010002), {'0x00010000': '0xCAFEF00D'})
+        self.assertEqual(self.dmem.dump_memory(0x00010000, 0x00010005), {
+            '0x00010000': '0xCAFEF00D',
+            '0x00010004': '0x00000001',
+        })
+        self.assertEqual(self.dmem.dump_memory(0x00010001, 0x00010008), {})
+
+    def test_is_written(self):
+        self.assertFalse(self.dmem.is_written(0x00010000))
+
+        self.dmem.write_word_int(0x00010000, 0)
+        self.dmem.write_byte(0x00010006, [0] * 8)
+
+        self.assertTrue(self.dmem.is_written(0x00010000))
+        self.assertTrue(self.dmem.is_written(0x00010004))
+        self.assertFalse(self.dmem.is_written(0x00010008))
+
+        with self.assertRaises(ValueError):
+            self.dmem.is_written(0x00010002)
+        with self.assertRaises(ValueError):
+            self.dmem.is_written(0x00010040)
+
+        self.dmem.clear()
+        self.assertFalse(self.dmem.is_written(0x00010000))
+
+    def test_clear_forgets_writes(self):
+        self.dmem.write_word_int(0x00010000, 0x12345678)
+        self.dmem.clear()
+
+        self.assertEqual(self.dmem.read_word_int(0x00010000), 0)
+        self.assertEqual(self.dmem.dump_memory(), {})
+
+if __name__ == '__main__':
+    unittest.main()
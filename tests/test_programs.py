@@ -5,13 +5,19 @@ Test program generator and runner for RISC-V CPU
 import sys
 import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(_ROOT)
 
 from cpu import CPU
 from hex_loader import load_hex_file
 from bit_utils import bits_to_int, to_hex_string, int_to_bits
 
-def run_test_program(hex_file: str, expected_regs: dict = None, expected_mem: dict = None, verbose: bool = False):
+_REG_ORDER = tuple(f"x{i}" for i in range(32))
+
+_SHARED_CPU = None
+
+def run_test_program(hex_file: str, expected_regs: dict = None, expected_mem: dict = None, verbose: bool = False,
+                     quiet: bool = False):
     print(f"\n{'='*60}")
     print(f"Running test program: {hex_file}")
     print(f"{'='*60}")
@@ -19,68 +25,75 @@ def run_test_program(hex_file: str, expected_regs: dict = None, expected_mem: di
     instructions = load_hex_file(hex_file)
     print(f"Loaded {len(instructions)} instructions")
     
-    cpu = CPU()
+    global _SHARED_CPU
+    if _SHARED_CPU is None:
+        _SHARED_CPU = CPU()
+    else:
+        _SHARED_CPU.reset()
+    cpu = _SHARED_CPU
     cpu.load_program(instructions)
     
     stats = cpu.run(max_cycles=1000, verbose=verbose)
     
-    print(f"\nExecution Statistics:")
-    print(f"  Cycles: {stats['cycles']}")
-    print(f"  Instructions: {stats['instructions']}")
-    print(f"  Halted: {stats['halted']}")
-    print(f"  Final PC: {hex(stats['final_pc'])}")
-    
     state = cpu.get_state()
-    
-    print(f"\nFinal Register State:")
     regs = state['registers']
-    for reg_name in sorted(regs.keys()):
-        reg_val = bits_to_int(regs[reg_name])
-        reg_hex = to_hex_string(regs[reg_name])
-        if reg_val != 0 or reg_name == 'x0':
-            print(f"  {reg_name}: {reg_hex} ({reg_val})")
-    
-    print(f"\nData Memory (non-zero):")
     mem = state['data_memory']
-    if mem:
-        for addr in sorted(mem.keys()):
-            print(f"  {addr}: {mem[addr]}")
-    else:
-        print("  (empty)")
+    reg_ints = {reg_name: bits_to_int(bits) for reg_name, bits in regs.items()}
+    
+    if not quiet:
+        print(f"\nExecution Statistics:")
+        print(f"  Cycles: {stats['cycles']}")
+        print(f"  Instructions: {stats['instructions']}")
+        print(f"  Halted: {stats['halted']}")
+        print(f"  Final PC: {hex(stats['final_pc'])}")
+        
+        lines = ["\nFinal Register State:"]
+        shown = [reg_name for reg_name in _REG_ORDER
+                 if reg_name in reg_ints and (reg_ints[reg_name] or reg_name == 'x0')]
+        for reg_name in shown:
+            lines.append(f"  {reg_name}: {to_hex_string(regs[reg_name])} ({reg_ints[reg_name]})")
+        
+        lines.append("\nData Memory (non-zero):")
+        if mem:
+            for addr in sorted(mem.keys()):
+                lines.append(f"  {addr}: {mem[addr]}")
+        else:
+            lines.append("  (empty)")
+        sys.stdout.write("\n".join(lines) + "\n")
+    
+    exp_regs_int = {reg_name: (val if isinstance(val, int) else int(val, 16))
+                    for reg_name, val in (expected_regs or {}).items()}
+    exp_mem_norm = {addr: (val.upper() if isinstance(val, str) else val)
+                    for addr, val in (expected_mem or {}).items()}
     
     all_passed = True
     if expected_regs:
-        print(f"\nVerifying Register Values:")
+        lines = ["\nVerifying Register Values:"]
         for reg_name, expected_val in expected_regs.items():
-            actual_val = bits_to_int(regs[reg_name])
-            if isinstance(expected_val, int):
-                passed = (actual_val == expected_val)
-            else:
-                expected_int = int(expected_val, 16)
-                passed = (actual_val == expected_int)
+            actual_val = reg_ints[reg_name]
+            passed = (actual_val == exp_regs_int[reg_name])
             
             status = "PASS" if passed else "FAIL"
-            print(f"  {reg_name}: Expected {expected_val}, Got {actual_val} - {status}")
+            lines.append(f"  {reg_name}: Expected {expected_val}, Got {actual_val} - {status}")
             if not passed:
                 all_passed = False
+        sys.stdout.write("\n".join(lines) + "\n")
     
     if expected_mem:
-        print(f"\nVerifying Memory Values:")
+        lines = ["\nVerifying Memory Values:"]
         for addr, expected_val in expected_mem.items():
             if addr in mem:
                 actual_val = mem[addr]
-                if isinstance(expected_val, str):
-                    passed = (actual_val.upper() == expected_val.upper())
-                else:
-                    passed = (actual_val == expected_val)
+                passed = (actual_val.upper() == exp_mem_norm[addr])
                 
                 status = "PASS" if passed else "FAIL"
-                print(f"  {addr}: Expected {expected_val}, Got {actual_val} - {status}")
+                lines.append(f"  {addr}: Expected {expected_val}, Got {actual_val} - {status}")
                 if not passed:
                     all_passed = False
             else:
-                print(f"  {addr}: Expected {expected_val}, Got (empty) - FAIL")
+                lines.append(f"  {addr}: Expected {expected_val}, Got (empty) - FAIL")
                 all_passed = False
+        sys.stdout.write("\n".join(lines) + "\n")
     
     if expected_regs or expected_mem:
         print(f"\n{'='*60}")
@@ -92,8 +105,8 @@ def run_test_program(hex_file: str, expected_regs: dict = None, expected_mem: di
     
     return all_passed, state
 
-def test_base_program():
-    prog_hex_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'prog.hex')
+def test_base_program(quiet: bool = True):
+    prog_hex_path = os.path.join(_ROOT, 'prog.hex')
     
     expected = {
         'x1': 5,
@@ -108,8 +121,8 @@ def test_base_program():
         '0x00010000': '0x0000000F'
     }
     
-    return run_test_program(prog_hex_path, expected, expected_mem)
+    return run_test_program(prog_hex_path, expected, expected_mem, quiet=quiet)
 
 if __name__ == "__main__":
-    test_base_program()
+    test_base_program(quiet='-q' in sys.argv[1:] or '--quiet' in sys.argv[1:])
 
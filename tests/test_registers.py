@@ -0,0 +1,120 @@
+"""
+Unit tests for registers and register files
+"""
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import registers
+from registers import Reg, RegisterFile, FPRegisterFile
+from cpu import CPU
+from bit_utils import from_hex_string, uint_to_int
+
+class TestRegisters(unittest.TestCase):
+
+    def test_single_register_module(self):
+        cpu = CPU()
+        self.assertIsInstance(cpu.reg_file, registers.RegisterFile)
+        self.assertIs(sys.modules['registers'], registers)
+
+    def test_x0_hard_wired(self):
+        rf = RegisterFile(32, 32)
+        rf.write(0, from_hex_string("0xFFFFFFFF", 32))
+        rf.write_int(0, 0x12345678)
+        rf.write_int(5, 0x1_0000_0007)
+
+        self.assertEqual(rf.read_int(0), 0)
+        self.assertEqual(rf.read(0), [0] * 32)
+        self.assertEqual(rf.read_int(5), 0x7, "Writes should be masked to the register width")
+
+        with self.assertRaises(ValueError):
+            rf.read_int(32)
+
+    def test_int_dump(self):
+        rf = RegisterFile(4, 32)
+        rf.write_int(1, 0xFFFFFFF8)
+        rf.write_int(2, 42)
+
+        self.assertEqual(rf.dump_registers_int(), {'x0': 0, 'x1': 0xFFFFFFF8, 'x2': 42, 'x3': 0})
+        self.assertEqual(uint_to_int(rf.read_int(1)), -8)
+        self.assertEqual(uint_to_int(rf.read_int(2)), 42)
+        self.assertEqual(uint_to_int(0x80, 8), -128)
+
+    def test_register_file_clear(self):
+        rf = RegisterFile(4, 32)
+        rf.write_int(1, 7)
+        rf.write_int(3, 0xFFFFFFFF)
+        rf.clear()
+        
+        self.assertEqual(rf.dump_registers_int(), {'x0': 0, 'x1': 0, 'x2': 0, 'x3': 0})
+    
+    def test_cpu_reset_matches_fresh_cpu(self):
+        program = [0x00500093, 0x000102B7, 0x0012A023, 0x0000006F]  # addi, lui, sw, halt
+        short_program = [0x00300113, 0x0000006F]  # addi x2, x0, 3; halt
+        
+        cpu = CPU()
+        cpu.load_program(program)
+        cpu.run(max_cycles=100)
+        cpu.reset()
+        
+        self.assertEqual(cpu.get_state_int(), CPU().get_state_int())
+        
+        cpu.load_program(short_program)
+        cpu.run(max_cycles=100)
+        fresh = CPU()
+        fresh.load_program(short_program)
+        fresh.run(max_cycles=100)
+        self.assertEqual(cpu.get_state_int(), fresh.get_state_int())
+    
+    def test_reg_load_and_clear(self):
+        reg = Reg(8)
+        reg.load([1, 0, 1])
+        self.assertEqual(reg.read(), [0, 0, 0, 0, 0, 1, 0, 1])
+
+        reg.load(0x1FF)
+        self.assertEqual(reg.read_int(), 0xFF)
+
+        reg.load([0] * 8, enable=False)
+        self.assertEqual(reg.read_int(), 0xFF)
+
+        reg.clear()
+        reg.clock_edge()
+        self.assertEqual(reg.read(), [0] * 8)
+
+    def test_fp_register_file(self):
+        fprf = FPRegisterFile(4, 8)
+        fprf.write(0, [1, 0, 1, 0, 1, 0, 1, 0])
+        fprf.clock_edge()
+
+        self.assertEqual(fprf.read(0), [1, 0, 1, 0, 1, 0, 1, 0], "f0 is not hard-wired")
+        self.assertEqual(list(fprf.dump_registers()), ['f0', 'f1', 'f2', 'f3'])
+
+    def test_register_views(self):
+        rf = RegisterFile(4, 8)
+        rf.write_int(1, 0x5A)
+        views = rf.registers
+
+        self.assertEqual(len(views), 4)
+        self.assertEqual(views[1].read_int(), 0x5A)
+        self.assertEqual(views[1].read(), [0, 1, 0, 1, 1, 0, 1, 0])
+
+        views[2].load([1, 1, 0, 0, 0, 0, 1, 1])
+        views[3].load(0x1FF)
+        views[3].load(0, enable=False)
+        self.assertEqual(rf.values, [0, 0x5A, 0xC3, 0xFF])
+
+        views[1].clear()
+        self.assertEqual(rf.read_int(1), 0)
+
+        with self.assertRaises(AttributeError):
+            rf.registers = []
+
+        fprf = FPRegisterFile(2, 8)
+        fprf.registers[0].load(0x81)
+        self.assertEqual(fprf.read_int(0), 0x81)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Unit tests for the barrel shifter
+"""
+
+import unittest
+import sys
+import os
+from array import array
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shifter import BarrelShifter, Shifter
+from bit_utils import from_hex_string, to_hex_string
+
+class TestShifter(unittest.TestCase):
+
+    def setUp(self):
+        self.barrel = BarrelShifter(32)
+
+    def test_bit_ops_match_int_ops(self):
+        test_cases = [
+            ("0x80000001", 1, 'SLL', "0x00000002"),
+            ("0x80000001", 31, 'SRL', "0x00000001"),
+            ("0x80000000", 4, 'SRA', "0xF8000000"),
+            ("0x7FFFFFFF", 31, 'SRA', "0x00000000"),
+            ("0x12345678", 0, 'SRA', "0x12345678"),
+        ]
+
+        for data_hex, amount, op, expected_hex in test_cases:
+            with self.subTest(op=op, amount=amount):
+                result = self.barrel.shift(from_hex_string(data_hex, 32), amount, op)
+                self.assertEqual(to_hex_string(result), expected_hex)
+                self.assertEqual(self.barrel.shift_int(int(data_hex, 16), amount, op),
+                               int(expected_hex, 16))
+
+    def test_byte_array_input(self):
+        data = from_hex_string("0x80000001", 32)
+        for op in ('SLL', 'SRL', 'SRA'):
+            with self.subTest(op=op):
+                self.assertEqual(self.barrel.shift(array('B', data), 3, op),
+                               self.barrel.shift(data, 3, op))
+
+    def test_oversized_shift_amounts(self):
+        self.assertEqual(self.barrel.shift_int(0xFFFFFFFF, 1000, 'SLL'), 0)
+        self.assertEqual(self.barrel.shift_int(0xFFFFFFFF, 1000, 'SRL'), 0)
+        self.assertEqual(self.barrel.shift_int(0x80000000, 1000, 'SRA'), 0xFFFFFFFF)
+        self.assertEqual(self.barrel.shift_int(0x40000000, 32, 'SRA'), 0)
+
+        # The Shifter front end only sees the low five bits of the amount
+        self.assertEqual(Shifter(32).execute_int(0x1, 33, 'SLL'), 0x2)
+
+    def test_batch_matches_scalar(self):
+        values = [0x00000000, 0x80000000, 0x7FFFFFFF, 0x12345678, 0xFFFFFFFF]
+        amounts = [0, 1, 31, 4, 33]
+
+        for width in (8, 32):
+            shifter = Shifter(width)
+            words = [value & shifter.mask for value in values]
+            for op in ('SLL', 'SRL', 'SRA'):
+                with self.subTest(width=width, op=op):
+                    expected = [shifter.execute_int(word, amount, op)
+                                for word, amount in zip(words, amounts)]
+                    self.assertEqual(shifter.execute_batch(words, amounts, op), expected)
+
+        with self.assertRaises(ValueError):
+            Shifter(32).execute_batch(values, amounts[:-1], 'SLL')
+
+    def test_invalid_inputs(self):
+        with self.assertRaises(ValueError):
+            self.barrel.shift([0] * 32, 1, 'ROL')
+        with self.assertRaises(ValueError):
+            self.barrel.shift([0] * 16, 1, 'SLL')
+        with self.assertRaises(ValueError):
+            Shifter(32).execute_int(0x1, 1, 'ROL')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,16 +5,42 @@ Unit tests for Two's Complement
 import unittest
 import sys
 import os
+import struct
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from twos_complement import encode_twos_complement, decode_twos_complement
+from twos_complement import encode_twos_complement, decode_twos_complement, _W32_MIN, _W32_MAX
 
 class TestTwosComplement(unittest.TestCase):
-    def setUp(self):
-        self.width = 32
-        self.min_val = -(2 ** (self.width - 1))
-        self.max_val = (2 ** (self.width - 1)) - 1
+    width = 32
+    min_val = _W32_MIN
+    max_val = _W32_MAX
+    
+    def _check_batch(self, values, expected_hex=None, expected_overflow=None, descriptions=None):
+        count = len(values)
+        words = struct.unpack(f'>{count}I', struct.pack(f'>{count}i', *values))
+        reference_hex = [f"0x{word:08X}" for word in words]
+        if expected_hex is not None:
+            self.assertEqual(reference_hex, list(expected_hex))
+        if expected_overflow is None:
+            expected_overflow = [0] * count
+        if descriptions is None:
+            descriptions = [f"value {value}" for value in values]
+        
+        for value, hex_str, overflow, description in zip(values, reference_hex,
+                                                         expected_overflow, descriptions):
+            with self.subTest(description=description):
+                result = encode_twos_complement(value)
+                
+                self.assertEqual(result['hex'], hex_str,
+                               f"Hex mismatch for {description}")
+                
+                self.assertEqual(result['overflow_flag'], overflow,
+                               f"Overflow mismatch for {description}")
+                
+                decoded = decode_twos_complement(hex_str)
+                self.assertEqual(decoded['value'], value,
+                               f"Round trip failed for {description}")
     
     def test_boundary_cases(self):
         test_cases = [
@@ -27,19 +53,8 @@ class TestTwosComplement(unittest.TestCase):
             (self.max_val, "0x7FFFFFFF", 0),
         ]
         
-        for value, expected_hex, expected_overflow in test_cases:
-            with self.subTest(value=value):
-                result = encode_twos_complement(value)
-                
-                self.assertEqual(result['hex'], expected_hex, 
-                               f"Hex mismatch for value {value}")
-                
-                self.assertEqual(result['overflow_flag'], expected_overflow,
-                               f"Overflow mismatch for value {value}")
-                
-                decoded = decode_twos_complement(result['hex'])
-                self.assertEqual(decoded['value'], value,
-                               f"Round trip failed for value {value}")
+        values, expected_hex, expected_overflow = zip(*test_cases)
+        self._check_batch(values, expected_hex, expected_overflow)
     
     def test_overflow_cases(self):
         overflow_cases = [
@@ -72,6 +87,36 @@ class TestTwosComplement(unittest.TestCase):
                 self.assertEqual(result['bin'], expected_bin,
                                f"Binary mismatch for {value}")
     
+    def test_narrow_widths_and_wrapping(self):
+        result = encode_twos_complement(-3, 8)
+        self.assertEqual(result['bin'], "11111101")
+        self.assertEqual(result['hex'], "0xFD")
+        self.assertEqual(result['overflow_flag'], 0)
+        
+        result = encode_twos_complement(-3, 12)
+        self.assertEqual(result['bin'], "11111111_1101")
+        self.assertEqual(result['hex'], "0xFFD")
+        
+        result = encode_twos_complement(2 ** 32 + 5)
+        self.assertEqual(result['hex'], "0x00000005")
+        self.assertEqual(result['overflow_flag'], 1)
+    
+    def test_decode_binary_and_list_inputs(self):
+        self.assertEqual(decode_twos_complement("1111_1101")['value'], -3)
+        self.assertEqual(decode_twos_complement("0101")['value'], 5)
+        self.assertEqual(decode_twos_complement([1, 0, 0, 0])['value'], -8)
+        self.assertEqual(decode_twos_complement("")['value'], 0)
+        
+        with self.assertRaises(ValueError):
+            decode_twos_complement("0102")
+        with self.assertRaises(ValueError):
+            decode_twos_complement("0x12G4")
+    
+    def test_decode_returns_fresh_dict(self):
+        first = decode_twos_complement("0xFFFFFFF3")
+        first['value'] = 0
+        self.assertEqual(decode_twos_complement("0xFFFFFFF3")['value'], -13)
+    
     def test_decode_edge_cases(self):
         test_cases = [
             ("0x00000000", 0),
@@ -93,16 +138,7 @@ class TestTwosComplement(unittest.TestCase):
             self.min_val // 2, self.max_val // 2,
         ]
         
-        for value in test_values:
-            with self.subTest(value=value):
-                if value < self.min_val or value > self.max_val:
-                    continue
-                
-                encoded = encode_twos_complement(value)
-                decoded = decode_twos_complement(encoded['hex'])
-                
-                self.assertEqual(decoded['value'], value,
-                               f"Round trip failed for {value}")
+        self._check_batch(test_values)
     
     def test_bit_pattern_consistency(self):
         test_cases = [
@@ -115,12 +151,8 @@ class TestTwosComplement(unittest.TestCase):
             ("0xFFFFFFF3", -13, "Negative thirteen"),
         ]
         
-        for hex_pattern, expected_decimal, description in test_cases:
-            with self.subTest(description=description):
-                result = decode_twos_complement(hex_pattern)
-                
-                self.assertEqual(result['value'], expected_decimal,
-                               f"Decimal mismatch for {description}: {hex_pattern}")
+        hex_patterns, expected_decimals, descriptions = zip(*test_cases)
+        self._check_batch(expected_decimals, hex_patterns, descriptions=descriptions)
 
 if __name__ == '__main__':
     unittest.main()
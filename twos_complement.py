@@ -2,17 +2,38 @@
 Two's Complement for RISC-V RV32 integer operations
 """
 
-from bit_utils import from_decimal_string, to_decimal_string, to_hex_string, format_bits
+from functools import lru_cache
+
+from bit_utils import HEX_DIGITS, bits_to_uint
+
+_W32_MASK = 0xFFFFFFFF
+_W32_MIN = -0x80000000
+_W32_MAX = 0x7FFFFFFF
+_W32_SIGN = 0x80000000
+
+_BIN_LUT = tuple(format(byte, "08b") for byte in range(256))
 
 def encode_twos_complement(value: int, width: int = 32) -> dict:
-    min_val = -(2 ** (width - 1))
-    max_val = (2 ** (width - 1)) - 1
-    overflow_flag = 1 if value < min_val or value > max_val else 0
+    if width == 32:
+        overflow_flag = 1 if value < _W32_MIN or value > _W32_MAX else 0
+        u = value & _W32_MASK
+        b3, b2, b1, b0 = u.to_bytes(4, 'big')
+        return {
+            'bin': "_".join((_BIN_LUT[b3], _BIN_LUT[b2], _BIN_LUT[b1], _BIN_LUT[b0])),
+            'hex': "0x" + format(u, "08X"),
+            'overflow_flag': overflow_flag
+        }
     
-    bits = from_decimal_string(str(value), width)
+    sign = 1 << (width - 1)
+    overflow_flag = 1 if value < -sign or value >= sign else 0
+    u = value & ((sign << 1) - 1)
     
-    bin_str = format_bits(bits, 8)
-    hex_str = to_hex_string(bits)
+    bin_raw = format(u, f"0{width}b")
+    if width > 8:
+        bin_str = "_".join([bin_raw[i:i + 8] for i in range(0, width, 8)])
+    else:
+        bin_str = bin_raw
+    hex_str = "0x" + format(u, f"0{(width + 3) // 4}X")
     
     return {
         'bin': bin_str,
@@ -22,26 +43,36 @@ def encode_twos_complement(value: int, width: int = 32) -> dict:
 
 def decode_twos_complement(bits_input) -> dict:
     if isinstance(bits_input, str):
-        if bits_input.startswith('0x') or bits_input.startswith('0X'):
-            from bit_utils import from_hex_string
-            bits = from_hex_string(bits_input)
-        else:
-            bits = []
-            for char in bits_input:
-                if char in '01':
-                    bits.append(int(char))
-                elif char == '_':
-                    continue
-                else:
-                    raise ValueError(f"Invalid binary character: {char}")
+        return {'value': _decode_str(bits_input)}
     elif isinstance(bits_input, list):
-        bits = bits_input[:]
+        width = len(bits_input)
+        u = bits_to_uint(bits_input)
+        if width and u >> (width - 1):
+            u -= 1 << width
+        return {'value': u}
     else:
         raise ValueError("bits_input must be string or list")
+
+@lru_cache(maxsize=256)
+def _decode_str(bits_input: str) -> int:
+    if bits_input.startswith('0x') or bits_input.startswith('0X'):
+        digits = bits_input[2:]
+        if digits.strip(HEX_DIGITS):
+            char = next(c for c in digits if c not in HEX_DIGITS)
+            raise ValueError(f"Invalid hex character: {char}")
+        u = int(digits, 16) & _W32_MASK if digits else 0
+        return u - (1 << 32) if u & _W32_SIGN else u
     
-    value = int(to_decimal_string(bits))
+    digits = bits_input.replace('_', '')
+    if digits.strip('01'):
+        char = next(c for c in digits if c not in '01')
+        raise ValueError(f"Invalid binary character: {char}")
+    if not digits:
+        return 0
     
-    return {'value': value}
+    width = len(digits)
+    u = int(digits, 2)
+    return u - (1 << width) if u >> (width - 1) else u
 
 def test_twos_complement():
     print("Testing Two's Complement Toolkit")